@@ -0,0 +1,47 @@
+"""Tools for digital Assyriology: cuneiform signs, transliteration and Akkadian nouns
+
+    import targul
+    targul.get_sign_list().lookup_name('A')
+    targul.declension.decline_noun('šarrum', 'm')
+
+Nothing is loaded at import. Submodules are imported on first access, and
+the sign table (get_sign_list) and the default Syllabifier
+(declension.get_syllabifier) are built on first use and shared by the
+whole process. The names of targul.signs, such as SignList and Sign, are
+also available here, as targul used to be a single module.
+
+The command line tools run as modules, e.g. python -m targul.pipeline.
+"""
+import importlib
+
+SUBMODULES = ('benchmark', 'create_json_from_csv', 'declension', 'decode', 'instrument', 'parse_word',
+              'pipeline', 'search', 'service', 'signs', 'stats', 'store', 'transliterate')
+
+# classes of the other submodules -> their submodule
+EXPORTS = {
+    'BulkDecoder': 'decode',
+    'SignSearch': 'search',
+    'SignStatistics': 'stats',
+    'SignStore': 'store',
+    'Transliterator': 'transliterate',
+}
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        value = importlib.import_module('.' + name, __name__)
+    elif name in EXPORTS:
+        value = getattr(importlib.import_module('.' + EXPORTS[name], __name__), name)
+    elif not name.startswith('_'):
+        try:
+            value = getattr(importlib.import_module('.signs', __name__), name)
+        except AttributeError:
+            raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name)) from None
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBMODULES) | set(EXPORTS))
@@ -0,0 +1,289 @@
+"""Benchmark the targul tools on a synthetic Akkadian corpus
+
+Usage:
+    python -m targul.benchmark [--words N] [--seed S] [--save-baseline] [--tolerance 0.25]
+    python -m targul.benchmark --imports-only [--save-baseline]
+
+Each benchmark reports throughput in words (or lookups) per second and
+peak memory. Results are compared
+with a stored baseline (benchmark_baseline.json) and any benchmark slower
+than the baseline by more than the tolerance is flagged as a regression,
+with exit status 1. Use --save-baseline to store the current results.
+
+The package and each tool are also imported in a fresh interpreter, and
+their python -X importtime startup cost, with everything they import, is
+budgeted the same way: an import slower than its baseline by more than
+the tolerance (and IMPORT_SLACK_MS) is a regression, so a new heavy import
+in a command line tool fails the run. As startup times differ between
+machines, the budgets are the baseline of the machine running the checks.
+Any import that opens a data file or builds a SignList or Syllabifier
+fails regardless of the baseline, so that no data loading creeps back into
+import time.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from . import declension, parse_word
+from .declension import AKKADIAN
+from .signs import SignList
+
+BASELINE = 'benchmark_baseline.json'
+
+# milliseconds an import may exceed its budget by, as very short imports
+# vary by more than the tolerance between runs
+IMPORT_SLACK_MS = 5
+
+# modules whose import is timed and must load nothing
+IMPORT_CHECKS = ('targul', 'targul.signs', 'targul.declension', 'targul.parse_word', 'targul.decode',
+                 'targul.transliterate', 'targul.search', 'targul.store', 'targul.stats',
+                 'targul.create_json_from_csv', 'targul.pipeline', 'targul.service')
+
+# run in a fresh interpreter with the module to import as argument, prints
+# the files other than python sources opened and the objects built meanwhile
+IMPORT_CHECK = """
+import gc, json, sys
+opened = []
+def audit(event, args):
+    if event == 'open' and isinstance(args[0], str) and not args[0].endswith(('.py', '.pyc', '.so')):
+        opened.append(args[0])
+sys.addaudithook(audit)
+__import__(sys.argv[1])
+classes = tuple(getattr(sys.modules[module], name) for module, name in
+                [('targul.signs', 'SignList'), ('targul.declension', 'Syllabifier')] if module in sys.modules)
+built = sorted({type(item).__name__ for item in gc.get_objects() if isinstance(item, classes)})
+print(json.dumps({'opened': opened, 'built': built}))
+"""
+
+
+def generate_words(count, seed=0, max_syllables=4, long_vowels=0.2, doubling=0.3):
+    """Returns count synthetic words built from the AKKADIAN inventory
+
+    Words are made of syllables with the shapes the syllabifier accepts:
+    an optional initial V or VC, then CV and CVC syllables. Vowels are long
+    (macron, or circumflex in the last syllable) with probability
+    long_vowels, and a CVC syllable's final consonant is doubled as the
+    next onset with probability doubling (šar-rum, ip-par-ras).
+    """
+    rng = random.Random(seed)
+    consonants = AKKADIAN['consonants']
+    short_vowels = AKKADIAN['short_vowels']
+
+    def vowel(final):
+        if rng.random() >= long_vowels:
+            return rng.choice(short_vowels)
+        if final and rng.random() < 0.3:
+            return rng.choice(AKKADIAN['circumflex_vowels'])
+        return rng.choice(AKKADIAN['macron_vowels'])
+
+    words = []
+    for _ in range(count):
+        length = rng.randint(1, max_syllables)
+        word = ''
+        coda = None
+        for i in range(length):
+            final = i == length - 1
+            shape = rng.choice(['V', 'VC', 'CV', 'CVC']) if i == 0 and length > 1 else rng.choice(['CV', 'CVC'])
+            if shape[0] == 'C':
+                onset = coda if coda and rng.random() < doubling else rng.choice(consonants)
+                word += onset
+            word += vowel(final)
+            coda = None
+            if shape[-1] == 'C':
+                coda = rng.choice(consonants)
+                word += coda
+        words.append(word)
+    return words
+
+
+def generate_nouns(count, seed=0):
+    """Returns count synthetic (lemma, gender) pairs in the nominative singular
+
+    Only nouns that decline_noun can decline are kept.
+    """
+    rng = random.Random(seed)
+    nouns = []
+    while len(nouns) < count:
+        for word in generate_words(count, rng.random(), max_syllables=2):
+            # make sure the stem ends in a consonant
+            if word[-1] not in AKKADIAN['consonants']:
+                word += rng.choice(AKKADIAN['consonants'])
+            if rng.random() < 0.5:
+                noun = (word + 'um', 'm')
+            else:
+                noun = (word + rng.choice(['tum', 'atum']), 'f')
+            try:
+                declension.decline_noun(*noun)
+            except ValueError:
+                continue
+            nouns.append(noun)
+    return nouns[:count]
+
+
+def measure(function, items, size=1, reset=None, repeat=3):
+    """Runs function over items, returns (words per second, peak KiB)
+
+    size is the number of words in each item, the best of repeat runs is kept.
+    reset, if given, is called before each run, e.g. to empty a cache the
+    previous run filled.
+    """
+    elapsed = float('inf')
+    for _ in range(repeat):
+        if reset:
+            reset()
+        start = time.perf_counter()
+        for item in items:
+            function(item)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    if reset:
+        reset()
+    tracemalloc.start()
+    for item in items:
+        function(item)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return len(items) * size / elapsed, peak / 1024
+
+
+def benchmarks(count, seed):
+    """Returns a dict of benchmark name -> (function, items, words per item[, reset])"""
+    words = generate_words(count, seed)
+    nouns = generate_nouns(count // 10 or 1, seed)
+    sign_list = SignList()
+    sign_list.construct_list()
+    signs = [sign.sign for sign in sign_list.sign_list]
+    names = [sign.name for sign in sign_list.sign_list]
+    values = [value for sign in sign_list.sign_list for value, periods in sign.values]
+    syllabifier = declension.Syllabifier()
+    # a corpus repeats its vocabulary, so batches draw from a tenth of the words
+    corpus = [words[i % (len(words) // 10 or 1)] for i in range(len(words))]
+    batches = [corpus[i:i + 1000] for i in range(0, len(corpus), 1000)]
+
+    return {
+        'Syllabifier.syllabify': (syllabifier.syllabify, words, 1),
+        # each run starts from an empty cache, hits come from the corpus repeating itself
+        'Syllabifier.syllabify_many': (syllabifier.syllabify_many, batches, 1000, syllabifier.cache.clear),
+        'parse_word.get_syllables': (parse_word.get_syllables, words, 1),
+        'parse_word.find_stress': (parse_word.find_stress, words, 1),
+        'parse_word.analyze_stress': (parse_word.analyze_stress, words, 1),
+        'get_cv_pattern': (declension.get_cv_pattern, words, 1),
+        'decline_noun': (lambda noun: declension.decline_noun(*noun), nouns, 1),
+        'decline_nouns': (lambda batch: list(declension.decline_nouns(batch)), [nouns], len(nouns)),
+        'SignList.lookup_sign': (sign_list.lookup_sign, signs * 10, 1),
+        'SignList.lookup_name': (sign_list.lookup_name, names * 10, 1),
+        'SignList.lookup_value': (sign_list.lookup_value, values * 10, 1),
+    }
+
+
+def run(count=100000, seed=0):
+    """Returns a dict of benchmark name -> {'per_second': ..., 'peak_kib': ...}"""
+    results = {}
+    for name, benchmark in benchmarks(count, seed).items():
+        per_second, peak = measure(*benchmark)
+        results[name] = {'per_second': per_second, 'peak_kib': peak}
+    return results
+
+
+def compare(results, baseline, tolerance=0.25):
+    """Returns the names of benchmarks slower than the baseline by more than tolerance
+
+    Throughput results have a 'per_second', import results an 'import_ms'.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        if 'import_ms' in result:
+            if result['import_ms'] > baseline[name]['import_ms'] * (1 + tolerance) + IMPORT_SLACK_MS:
+                regressions.append(name)
+        elif result['per_second'] < baseline[name]['per_second'] * (1 - tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def check_import(module, repeat=7):
+    """Imports a module in fresh interpreters and returns its cost and what it loaded
+
+    Returns a dict with 'import_ms', the best cumulative python -X
+    importtime of the module and the package, the data files 'opened' and
+    the names of the SignList or Syllabifier objects 'built' by the import.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best = float('inf')
+    for _ in range(repeat):
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', IMPORT_CHECK, module],
+                                 cwd=root, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                 universal_newlines=True, check=True)
+        result = json.loads(process.stdout)
+        # lines are "import time: self [us] | cumulative | imported package",
+        # the package is imported on its own before the module
+        cumulative = 0
+        for line in process.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() in ('targul', module):
+                cumulative += int(fields[1])
+        best = min(best, cumulative / 1000)
+    result['import_ms'] = best
+    return result
+
+
+def check_imports(modules=IMPORT_CHECKS):
+    """Returns a dict of 'import module' -> check_import(module)"""
+    return {'import ' + module: check_import(module) for module in modules}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=100000, help="size of the synthetic corpus")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="fraction of baseline throughput (or import time) that may be lost before flagging")
+    parser.add_argument('--imports-only', action='store_true',
+                        help="only check the import budgets")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    imports = check_imports()
+    loading = [name for name, result in imports.items() if result['opened'] or result['built']]
+    results = {name: {'import_ms': result['import_ms']} for name, result in imports.items()}
+    if not args.imports_only:
+        results.update(run(args.words, args.seed))
+    regressions = compare(results, baseline, args.tolerance)
+
+    for name, result in results.items():
+        if 'import_ms' in result:
+            line = "{:36} {:>8,.1f} ms".format(name, result['import_ms'])
+            if name in baseline:
+                line += "  {:+.0%}".format(result['import_ms'] / baseline[name]['import_ms'] - 1)
+            if name in loading:
+                line += "  LOADS DATA: {}".format(', '.join(imports[name]['built'] + imports[name]['opened']))
+        else:
+            line = "{:30} {:>12,.0f} /s {:>10,.0f} KiB".format(name, result['per_second'], result['peak_kib'])
+            if name in baseline:
+                line += "  {:+.0%}".format(result['per_second'] / baseline[name]['per_second'] - 1)
+        if name in regressions:
+            line += "  REGRESSION"
+        print(line)
+
+    if args.save_baseline:
+        # --imports-only updates the import budgets and keeps the rest
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2)
+    return 1 if regressions or loading else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Export the table of cuneiform signs as json lines validated against sign_schema.json
+
+Usage:
+    python -m targul.create_json_from_csv [--output signs.jsonl] [--processes N]
+
+Each valid row is written as one json object per line, in table order.
+Invalid rows are reported on stderr with their line number and every schema
+error, and the exit status is 1 if there were any.
+"""
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from .signs import TABLE
+
+SOURCE = TABLE
+SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sign_schema.json")
+HEADER = 2
+FIELDNAMES = ['sign', 'codepoint', 'name', 'Borger(2003)', 'Borger(1981)', 'comments']
+
+# validator for each pool worker, compiled once by _init_worker
+_validator = None
+
+
+def load_validator(schema=SCHEMA):
+    """Reads and checks the schema once, returns a reusable validator"""
+    # jsonschema is slow to import and only needed here
+    import jsonschema
+
+    with open(schema) as f:
+        schema = json.load(f)
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+def read_rows(source=SOURCE, header=HEADER):
+    """Yields (line number, row) from the source without reading it all"""
+    with open(source, newline='') as f:
+        reader = csv.DictReader(itertools.islice(f, header, None), FIELDNAMES)
+        for line in reader:
+            # line_num counts from the first line after the header
+            yield reader.line_num + header, line
+
+
+def row_to_json(line):
+    """Turns a row of the table into a json object for a sign"""
+    sign = line['sign']
+    codepoint = line['codepoint']
+    name = line['name']
+    # for now the value will be the name
+    value = line['name']
+    comments = line['comments']
+    return {
+        "codepoint": codepoint,
+        "name": name,
+        "glyph": [
+            {
+                "glyph": sign
+            }
+        ],
+        "value": [
+            {
+                "value": value
+            }
+        ],
+        "notes": comments
+    }
+
+
+def validate(json_object, validator):
+    """Returns a list of error messages, empty if the object is valid"""
+    errors = []
+    for error in sorted(validator.iter_errors(json_object), key=lambda e: list(e.path)):
+        path = '/'.join(str(p) for p in error.path) or '(root)'
+        errors.append("{}: {}".format(path, error.message))
+    return errors
+
+
+def convert(row, validator=None):
+    """Converts and validates one (line number, row), returns (line number, json string, errors)"""
+    line_number, line = row
+    json_object = row_to_json(line)
+    errors = validate(json_object, validator or _validator)
+    return line_number, json.dumps(json_object, ensure_ascii=False), errors
+
+
+def _init_worker(schema):
+    global _validator
+    _validator = load_validator(schema)
+
+
+def export(output, source=SOURCE, schema=SCHEMA, errors=sys.stderr, processes=None, chunksize=256):
+    """Writes json lines for the source to output, returns (rows, invalid rows)
+
+    With processes set, rows are validated in a pool of that many workers
+    (0 for one per cpu) and still written in table order.
+    """
+    rows = read_rows(source)
+    if processes is None:
+        validator = load_validator(schema)
+        results = (convert(row, validator) for row in rows)
+        return _write(results, output, errors, source)
+
+    with multiprocessing.Pool(processes or None, _init_worker, (schema,)) as pool:
+        return _write(pool.imap(convert, rows, chunksize), output, errors, source)
+
+
+def _write(results, output, errors, source):
+    count = invalid = 0
+    for line_number, json_sign, messages in results:
+        count += 1
+        if messages:
+            invalid += 1
+            for message in messages:
+                print("{} line {}: {}".format(source, line_number, message), file=errors)
+            continue
+        output.write(json_sign + '\n')
+    return count, invalid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', default=SOURCE)
+    parser.add_argument('--schema', default=SCHEMA)
+    parser.add_argument('--output', '-o', help="defaults to stdout")
+    parser.add_argument('--processes', '-p', type=int,
+                        help="validate in a process pool, 0 for one worker per cpu")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            count, invalid = export(output, args.source, args.schema, processes=args.processes)
+    else:
+        count, invalid = export(sys.stdout, args.source, args.schema, processes=args.processes)
+    elapsed = time.perf_counter() - start
+
+    print("{} rows, {} invalid, {:.2f} s, {:.0f} rows/s".format(count, invalid, elapsed, count / elapsed),
+          file=sys.stderr)
+    return 1 if invalid else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,679 @@
+import functools
+import pickle
+import sys
+from collections import OrderedDict
+from types import MappingProxyType
+
+from . import instrument, parse_word
+
+AKKADIAN = {
+    'short_vowels': ['a', 'e', 'i', 'u'],
+    'macron_vowels': ['ā', 'ē', 'ī', 'ū'],
+    'circumflex_vowels': ['â', 'ê', 'î', 'û'],
+
+    'consonants': ['b', 'd', 'g', 'ḫ', 'k', 'l', 'm',
+                   'n', 'p', 'q', 'r', 's', 'ṣ', 'š',
+                   't', 'ṭ', 'w', 'y', 'z', 'ʾ']
+}
+
+ENDINGS = {
+    'm': {
+        'singular': {
+            'nominative': 'um',
+            'accusative': 'am',
+            'genitive': 'im'
+        },
+        'dual': {
+            'nominative': 'ān',
+            'oblique': 'īn'
+        },
+        'plural': {
+            'nominative': 'ū',
+            'oblique': 'ī'
+        }
+    },
+    'f': {
+        'singular': {
+            'nominative': 'tum',
+            'accusative': 'tam',
+            'genitive': 'tim'
+        },
+        'dual': {
+            'nominative': 'tān',
+            'oblique': 'tīn'
+        },
+        'plural': {
+            'nominative': ['ātum', 'ētum', 'ītum'],
+            'oblique': ['ātim', 'ētim', 'ītum']
+        }
+    }
+}
+
+CONSONANTS = frozenset(AKKADIAN['consonants'])
+
+# maps long vowels to their short vowel
+REMOVE_LENGTH = str.maketrans(dict(zip(AKKADIAN['macron_vowels'] + AKKADIAN['circumflex_vowels'],
+                                       AKKADIAN['short_vowels'] * 2)))
+
+SUBSCRIPTS = str.maketrans('0123456789', '₀₁₂₃₄₅₆₇₈₉')
+
+
+class Syllabifier(object):
+    """Split Akkadian words into list of syllables"""
+
+    def __init__(self, language=AKKADIAN, cache_size=100000):
+        self.language = language
+
+        # Character classes are compiled once: each consonant maps to 'C' and
+        # each vowel to 'V', so a word's CV string is a single str.translate.
+        self.consonants = frozenset(language['consonants'])
+        self.vowels = frozenset(language['short_vowels'] +
+                                language['macron_vowels'] +
+                                language['circumflex_vowels'])
+        classes = dict.fromkeys(self.consonants, 'C')
+        classes.update(dict.fromkeys(self.vowels, 'V'))
+        self.classes = str.maketrans(classes)
+
+        # LRU cache of word -> syllables for syllabify_many
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _is_consonant(self, char):
+        return char in self.consonants
+
+    def _is_vowel(self, char):
+        return char in self.vowels
+
+    @instrument.timed('declension.syllabify')
+    def syllabify(self, word):
+        return parse_word.split_syllables(word, self.classes, 'syllabify')
+
+    def syllabify_many(self, words):
+        """Syllabify a list of words, serving repeated words from the cache"""
+        cache = self.cache
+        unique = {}
+        for word in words:
+            if word in unique:
+                self.hits += 1
+            elif word in cache:
+                self.hits += 1
+                cache.move_to_end(word)
+                unique[word] = cache[word]
+            else:
+                self.misses += 1
+                syllables = tuple(self.syllabify(word))
+                unique[word] = cache[word] = syllables
+                if len(cache) > self.cache_size:
+                    cache.popitem(last=False)
+        return [list(unique[word]) for word in words]
+
+    def cache_info(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self.cache), 'maxsize': self.cache_size}
+
+    def save_cache(self, path):
+        """Persist the cache so a later run can reuse it with load_cache"""
+        with open(path, 'wb') as f:
+            pickle.dump(list(self.cache.items()), f, pickle.HIGHEST_PROTOCOL)
+
+    def load_cache(self, path):
+        """Load a cache saved by save_cache, keeping the most recent words"""
+        with open(path, 'rb') as f:
+            items = pickle.load(f)
+        self.cache.update(items[-self.cache_size:])
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+
+# the Syllabifier shared by the module functions, see get_syllabifier
+_syllabifier = None
+
+
+def get_syllabifier():
+    """Returns the default Syllabifier, made on first use and shared by the process"""
+    global _syllabifier
+    if _syllabifier is None:
+        _syllabifier = Syllabifier()
+    return _syllabifier
+
+
+def __getattr__(name):
+    # syll used to be made at import
+    if name == 'syll':
+        return get_syllabifier()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def get_cv_pattern(word, pprint=False):
+    # input = iparras
+    # pattern = [('V', 1, 'i'), ('C', 1, 'p'), ('V', 2, 'a'), ('C', 2, 'r'),
+    #           ('C', 2, 'r'), ('V', 2, 'a'), ('C', 3, 's')]
+    # pprint = V₁C₁V₂C₂C₂V₂C₃
+    pattern = []
+    # first occurrence of each letter -> its number
+    numbers = {}
+    counts = {'C': 0, 'V': 0}
+    # remove length:
+    for char in word.translate(REMOVE_LENGTH):
+        cv = 'C' if char in CONSONANTS else 'V'
+        number = numbers.get(char)
+        if number is None:
+            counts[cv] += 1
+            number = numbers[char] = counts[cv]
+        pattern.append((cv, number, char))
+    if pprint:
+        return ''.join(cv + str(number).translate(SUBSCRIPTS) for cv, number, char in pattern)
+    return pattern
+
+
+class TemplateIndex(object):
+    """Index of words by their CV template, e.g. C₁V₁C₂C₂V₂C₃ -> šarrum, ..."""
+
+    def __init__(self, words=()):
+        # template -> dict of words, used as an ordered set
+        self.index = {}
+        self.add_many(words)
+
+    def add(self, word):
+        self.index.setdefault(get_cv_pattern(word, pprint=True), {})[word] = None
+
+    def add_many(self, words):
+        for word in words:
+            self.add(word)
+
+    def lookup(self, template):
+        """Returns the words matching a template from get_cv_pattern(pprint=True)"""
+        return list(self.index.get(template, ()))
+
+    def templates(self):
+        return list(self.index)
+
+
+def compile_endings(endings=ENDINGS):
+    """Compile the endings into gender -> {ending: (stem suffix, features)}
+
+    features is a tuple of (case, number) pairs, since an ending can mark
+    more than one case. Feminine stems keep their -t, and feminine nouns can
+    also take the masculine singular and dual endings.
+    """
+    table = {'m': {}, 'f': {}}
+
+    def add(gender, ending, suffix, case, number):
+        suffix, features = table[gender].get(ending, (suffix, ()))
+        if (case, number) not in features:
+            table[gender][ending] = (suffix, features + ((case, number),))
+
+    for gender in table:
+        for number, cases in endings[gender].items():
+            for case, forms in cases.items():
+                if isinstance(forms, str):
+                    forms = [forms]
+                for ending in forms:
+                    add(gender, ending, 't' if gender == 'f' else '', case, number)
+    for number in ['singular', 'dual']:
+        for case, ending in endings['m'][number].items():
+            add('f', ending, '', case, number)
+    return table
+
+
+SUFFIXES = compile_endings()
+
+# ending lengths to try for each gender, longest first
+SUFFIX_LENGTHS = {gender: sorted({len(ending) for ending in table}, reverse=True)
+                  for gender, table in SUFFIXES.items()}
+
+
+def match_ending(noun, gender):
+    """Returns (stem, ending, features) for the longest matching ending, or None"""
+    table = SUFFIXES.get(gender)
+    if table is None:
+        return None
+    for length in SUFFIX_LENGTHS[gender]:
+        ending = noun[-length:]
+        if ending in table:
+            suffix, features = table[ending]
+            return noun[:-length] + suffix, ending, features
+    return None
+
+
+@instrument.timed('declension.get_stem')
+def get_stem(noun, gender, mimation=True):
+    stem = ''
+    if mimation and noun[-1:] == 'm':
+        # noun = noun[:-1]
+        pass
+    # Take off ending
+    match = match_ending(noun, gender)
+    if match:
+        stem = match[0]
+        if instrument.enabled:
+            instrument.count('get_stem.' + match[1])
+        return stem
+    if instrument.enabled:
+        instrument.sample('get_stem.unknown', [noun, gender])
+    if gender == 'm':
+        print("Unknown masculine noun: {}".format(noun))
+    elif gender == 'f':
+        print("Unknown feminine noun: {}".format(noun))
+    else:
+        print("Unknown noun: {}".format(noun))
+    return stem
+
+
+@functools.lru_cache(maxsize=65536)
+def analyze_noun(noun, gender):
+    """Returns (stem, syllables, cv pattern) of a noun, computed once per noun
+
+    get_bound_form works from these, so building paradigms or re-analyzing
+    the same noun does not syllabify it again. With instrumentation on, the
+    get_stem and syllabify counters only see the cache misses.
+    """
+    stem = get_stem(noun, gender)
+    return stem, tuple(get_syllabifier().syllabify(noun)), tuple(get_cv_pattern(stem))
+
+
+@instrument.timed('declension.get_bound_form')
+def get_bound_form(noun, gender):
+    stem, syllables, cv = analyze_noun(noun, gender)
+    counting = instrument.enabled
+    if len(cv) < 2:
+        # an unknown noun has no stem, and the rules need two letters
+        if counting:
+            instrument.sample('bound_form.unknown', [noun, gender])
+        return None
+    # Based on Huehnergard Appendix 6.C.1: base in -VC
+    if tuple(letter[0] for letter in cv[-2:]) == ('V', 'C') or stem in ['nakr']:
+        # a. 2-syllable
+        if len(syllables) > 2:
+            if counting:
+                instrument.count('bound_form.6.C.1.a')
+            # awīlum > awīl, nakrum > naker
+            if stem in ['nakr']:
+                return 'naker'
+            else:
+                return stem
+        # b. 1-syllable
+        elif len(syllables) > 1:
+            if counting:
+                instrument.count('bound_form.6.C.1.b')
+            # bēlum > bēl
+            return stem
+        # c. abum, aḫum
+        if stem in ['ab', 'aḫ']:
+            if counting:
+                instrument.count('bound_form.6.C.1.c')
+            return stem + 'i'
+    # Appendix 6.C.2: base in -C₁C₁
+    if cv[-1][:2] == cv[-2][:2]:
+        # a. 1-syllable
+        if 3 > len(syllables) > 1:
+            if counting:
+                instrument.count('bound_form.6.C.2.a')
+            return stem + 'i'
+        # b. 2-syllable, -tt
+        if len(syllables) > 2 and cv[-1][2] + cv[-2][2] == 'tt':
+            if counting:
+                instrument.count('bound_form.6.C.2.b')
+            return stem + 'i'
+        # c. 2-syllable, other
+        if len(syllables) > 2:
+            if counting:
+                instrument.count('bound_form.6.C.2.c')
+            return stem[:-1]
+    # Appendix 6.C.3: base in -C₁C₂, C₂ ≠ t, i.e. pVrs
+    if cv[-1][0] == cv[-2][0] and cv[-1][1] != cv[-2][1]:
+        if counting:
+            instrument.count('bound_form.6.C.3')
+        return stem[:-1] + stem[1] + stem[-1]
+    # Appendix 6.C.4: base in -Ct (fem.)
+    if cv[-1][2] == 't' and cv[-2][0] == 'C':
+        if len(syllables) > 2:
+            if counting:
+                instrument.count('bound_form.6.C.4')
+            return stem + 'i'
+        # Need to deal with fem. Ptcpl. māḫirtum -> māḫirat
+        if len(syllables) > 1:
+            # These are case by case
+            if stem in ['qīšt']:
+                if counting:
+                    instrument.count('bound_form.6.C.4.qīšt')
+                return stem + 'i'
+            if stem in ['mārt']:
+                if counting:
+                    instrument.count('bound_form.6.C.4.mārt')
+                return stem[:-1] + stem[1] + stem[-1]
+                # Appendix 6.C.5: base in -V
+                # Weak nouns...
+    if counting:
+        instrument.sample('bound_form.unknown', [noun, gender])
+
+
+def compile_paradigms(endings=ENDINGS):
+    """Compile the endings into gender -> tuple of (ending, features) per cell
+
+    Cells are in the order of the endings, and features is the shared
+    FEATURES object of the cell. Feminine singular and dual endings drop
+    their t, which the stem keeps, and feminine plural cells hold a dict
+    of theme vowel -> ending instead of an ending.
+    """
+    table = {}
+    for gender, numbers in endings.items():
+        cells = []
+        for number, cases in numbers.items():
+            for case, ending in cases.items():
+                if not isinstance(ending, str):
+                    themes = {}
+                    for form in ending:
+                        themes.setdefault(form[0], form)
+                    ending = themes
+                elif gender == 'f':
+                    ending = ending[1:]
+                cells.append((ending, FEATURES.setdefault((case, number), MappingProxyType(
+                    {'case': case, 'number': number}))))
+        table[gender] = tuple(cells)
+    return table
+
+
+# (case, number) -> read-only {'case': ..., 'number': ...} shared by every paradigm
+FEATURES = {}
+
+PARADIGMS = compile_paradigms()
+
+
+def _decline(stem, gender):
+    """Returns the paradigm of a stem as a tuple of (form, features)"""
+    cells = PARADIGMS[gender]
+    if gender != 'f':
+        return tuple((stem + ending, features) for ending, features in cells)
+
+    # the theme vowel and base of the plural are the same for every case
+    if len(stem) < 3:
+        raise ValueError("Feminine stem too short to decline: {}".format(stem))
+    theme_vowel = stem[-3] if stem[-3] in AKKADIAN['macron_vowels'] else 'ā'
+    if stem[-2] in AKKADIAN['short_vowels']:
+        base = stem[:-2]
+    elif stem[-1] in CONSONANTS and stem[-2] in AKKADIAN['macron_vowels']:
+        base = stem
+    else:
+        base = stem[:-1]
+
+    paradigm = []
+    for ending, features in cells:
+        if isinstance(ending, str):
+            paradigm.append((stem + ending, features))
+        elif theme_vowel in ending:
+            paradigm.append((base + ending[theme_vowel], features))
+        else:
+            raise ValueError("No plural ending with theme vowel {}: {}".format(theme_vowel, stem))
+    return tuple(paradigm)
+
+
+@instrument.timed('declension.decline_noun')
+def decline_noun(noun, gender, case=None, number=None, mimation=True):
+    stem = get_stem(noun, gender)
+    return [(form, dict(features)) for form, features in _decline(stem, gender)]
+
+
+def decline_nouns(lexicon, errors='raise'):
+    """Lazily yields (lemma, gender, paradigm) for each (lemma, gender) in a lexicon
+
+    paradigm is a tuple of (form, features) in the order of ENDINGS. The
+    features are the shared read-only FEATURES objects, one per case and
+    number, so a large lexicon only holds its forms. Nouns that cannot be
+    declined raise ValueError, or are left out with errors='skip'.
+    """
+    if errors not in ('raise', 'skip'):
+        raise ValueError("Unknown errors option: {}".format(errors))
+    for lemma, gender in lexicon:
+        try:
+            match = match_ending(lemma, gender)
+            if match is None:
+                raise ValueError("Unknown noun: {} ({})".format(lemma, gender))
+            paradigm = _decline(match[0], gender)
+        except ValueError:
+            if errors == 'skip':
+                continue
+            raise
+        yield lemma, gender, paradigm
+
+
+def write_paradigms(lexicon, f, errors='raise'):
+    """Writes the paradigms of a lexicon to a tab separated file, returns the row count
+
+    There is a row per lemma and a column per case and number, so the
+    features are only written once, in the header.
+    """
+    # csv is only needed here, so importing the module stays fast
+    import csv
+
+    writer = csv.writer(f, delimiter='\t', lineterminator='\n')
+    writer.writerow(['lemma', 'gender'] + ['{}.{}'.format(case, number) for case, number in FEATURES])
+    count = 0
+    for lemma, gender, paradigm in decline_nouns(lexicon, errors):
+        forms = {(features['case'], features['number']): form for form, features in paradigm}
+        writer.writerow([lemma, gender] + [forms.get(cell, '') for cell in FEATURES])
+        count += 1
+    return count
+
+
+class NounAnalyzer(object):
+    """Lemmatize inflected nouns with a precomputed index of every form
+
+    Each (lemma, gender) in the lexicon is declined once with decline_nouns
+    and get_bound_form, and the index maps every form to a tuple of
+    (lemma, case, number) analyses. Bound forms have the case 'bound'.
+    Lemmata that cannot be declined raise ValueError, or are left out with
+    errors='skip', as in decline_nouns.
+    """
+
+    def __init__(self, lexicon=(), errors='raise'):
+        self.index = {}
+        for lemma, gender, paradigm in decline_nouns(lexicon, errors):
+            self._add_paradigm(lemma, gender, paradigm)
+
+    def add(self, lemma, gender):
+        """Adds the forms of a lemma, ValueError if it cannot be declined"""
+        for lemma, gender, paradigm in decline_nouns([(lemma, gender)]):
+            self._add_paradigm(lemma, gender, paradigm)
+
+    def _add_paradigm(self, lemma, gender, paradigm):
+        lemma = sys.intern(lemma)
+        for form, features in paradigm:
+            self._add(form, (lemma, features['case'], features['number']))
+        bound = get_bound_form(lemma, gender)
+        if bound:
+            self._add(bound, (lemma, 'bound', 'singular'))
+
+    def _add(self, form, analysis):
+        analyses = self.index.get(form, ())
+        if analysis not in analyses:
+            self.index[sys.intern(form)] = analyses + (analysis,)
+
+    def analyze(self, form):
+        """Returns a list of (lemma, case, number) for the form"""
+        return list(self.index.get(form, ()))
+
+    def lemmatize(self, form):
+        """Returns the possible lemmata of the form"""
+        return list(OrderedDict.fromkeys(analysis[0] for analysis in self.index.get(form, ())))
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump(self.index, f, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        analyzer = cls()
+        with open(path, 'rb') as f:
+            analyzer.index = pickle.load(f)
+        return analyzer
+
+
+SYLLABIFY_TEST_WORDS = ['balāṭī', 'elûm', 'ṣabat', 'īteneppuš', 'narkabtum', 'epištašu',
+                        'kiam', 'kiʾam', 'ibnû', 'idūk', 'iparras', 'nidittum', 'idūkū',
+                        'tēteneppušā', 'itâršum', 'napištašunu', 'zikarum', 'šunu', 'ilū',
+                        'ilum', 'šarrum', 'iltum', 'šarratum', 'nārum', 'awīlum', 'bēlum']
+
+
+def _syllabify_reference(word, language=AKKADIAN):
+    """The original character by character syllabifier, to check and time Syllabifier against"""
+    def is_consonant(char):
+        return char in language['consonants']
+
+    def is_vowel(char):
+        return char in language['short_vowels'] + \
+                       language['macron_vowels'] + \
+                       language['circumflex_vowels']
+
+    syllables = []
+
+    # If there's an initial vowel and the word is longer than 2 letters,
+    # and the third syllable is a not consonant (easy way to check for VCC pattern),
+    # the initial vowel is the first syllable.
+    # Rule (b.ii)
+    if is_vowel(word[0]):
+        if len(word) > 2 and not is_consonant(word[2]):
+            syllables.append(word[0])
+            word = word[1:]
+
+    # flip the word and count from the back:
+    word = word[::-1]
+
+    # Here we iterate over the characters backwards trying to match
+    # consonant and vowel patterns in a hierarchical way.
+    # Each time we find a match we store the syllable (in reverse order)
+    # and move the index ahead the length of the syllable.
+    syllables_reverse = []
+    i = 0
+    while i < len(word):
+        char = word[i]
+
+        # CV:
+        if is_vowel(char):
+            syllables_reverse.append(word[i + 1] + word[i])
+            i += 2
+
+        # CVC and VC:
+        elif is_consonant(char):
+            if is_vowel(word[i + 1]):
+                # If there are only two characters left, that's it.
+                if i + 2 >= len(word):
+                    syllables_reverse.append(word[i + 1] + word[i])
+                    break
+                # CVC
+                elif is_consonant(word[i + 2]):
+                    syllables_reverse.append(word[i + 2] + word[i + 1] + word[i])
+                    i += 3
+                # VC (remember it's backwards here)
+                elif is_vowel(word[i + 2]):
+                    syllables_reverse.append(word[i + 1] + word[i])
+                    i += 2
+
+    return syllables + syllables_reverse[::-1]
+
+
+def test_syllabify():
+    syll = get_syllabifier()
+    for word in SYLLABIFY_TEST_WORDS:
+        print(syll.syllabify(word) == _syllabify_reference(word))
+
+
+def benchmark_syllabify(number=2000):
+    """Compares the compiled syllabifier against the reference one"""
+    import timeit
+
+    words = SYLLABIFY_TEST_WORDS
+    syll = get_syllabifier()
+    reference = timeit.timeit(lambda: [_syllabify_reference(w) for w in words], number=number)
+    compiled = timeit.timeit(lambda: [syll.syllabify(w) for w in words], number=number)
+    count = len(words) * number
+    print("reference: {:.0f} words/s".format(count / reference))
+    print("compiled:  {:.0f} words/s".format(count / compiled))
+    print("speedup:   {:.1f}x".format(reference / compiled))
+
+
+def test_get_cv_pattern():
+    print(get_cv_pattern('iparras', pprint=True) == 'V₁C₁V₂C₂C₂V₂C₃')
+    print(get_cv_pattern('šarrum', pprint=True) == 'C₁V₁C₂C₂V₂C₃')
+    print(TemplateIndex(['šarrum', 'kalbum', 'iparras', 'šarrum']).lookup('C₁V₁C₂C₂V₂C₃') == ['šarrum'])
+
+
+def test_noun_analyzer():
+    analyzer = NounAnalyzer([('šarrum', 'm'), ('šarratum', 'f'), ('ilum', 'm')])
+    print(analyzer.analyze('šarrātim') == [('šarratum', 'oblique', 'plural')])
+    print(analyzer.analyze('šarri') == [('šarrum', 'bound', 'singular')])
+    print(analyzer.lemmatize('ilī') == ['ilum'])
+    print(analyzer.analyze('awīlum') == [])
+    # an unknown lemma is left out rather than indexing its bare endings
+    analyzer = NounAnalyzer([('šarrum', 'm'), ('bēlu', 'm')], errors='skip')
+    print(analyzer.lemmatize('šarri') == ['šarrum'] and analyzer.analyze('um') == [])
+    try:
+        NounAnalyzer([('bēlu', 'm')])
+    except ValueError:
+        print(True)
+    print(get_bound_form('bēlu', 'm') is None)
+
+
+def test_get_stem():
+    print(get_stem('ilum', 'm') == 'il')
+    print(get_stem('šarrū', 'm') == 'šarr')
+    print(get_stem('ilātum', 'f') == 'ilt')
+    print(get_stem('bēltān', 'f') == 'bēlt')
+
+
+def test_decline_noun():
+    print(sorted(decline_noun('ilum', 'm')) ==
+          sorted([('ilim', {'case': 'genitive', 'number': 'singular'}),
+                  ('ilum', {'case': 'nominative', 'number': 'singular'}),
+                  ('ilam', {'case': 'accusative', 'number': 'singular'}),
+                  ('ilīn', {'case': 'oblique', 'number': 'dual'}),
+                  ('ilān', {'case': 'nominative', 'number': 'dual'}),
+                  ('ilī', {'case': 'oblique', 'number': 'plural'}),
+                  ('ilū', {'case': 'nominative', 'number': 'plural'})]))
+
+    print(sorted(decline_noun('šarrum', 'm')) ==
+          sorted([('šarrim', {'case': 'genitive', 'number': 'singular'}),
+                  ('šarrum', {'case': 'nominative', 'number': 'singular'}),
+                  ('šarram', {'case': 'accusative', 'number': 'singular'}),
+                  ('šarrīn', {'case': 'oblique', 'number': 'dual'}),
+                  ('šarrān', {'case': 'nominative', 'number': 'dual'}),
+                  ('šarrī', {'case': 'oblique', 'number': 'plural'}),
+                  ('šarrū', {'case': 'nominative', 'number': 'plural'})]))
+
+    print(sorted(decline_noun('iltum', 'f')) ==
+          sorted([('iltim', {'case': 'genitive', 'number': 'singular'}),
+                  ('iltum', {'case': 'nominative', 'number': 'singular'}),
+                  ('iltam', {'case': 'accusative', 'number': 'singular'}),
+                  ('iltīn', {'case': 'oblique', 'number': 'dual'}),
+                  ('iltān', {'case': 'nominative', 'number': 'dual'}),
+                  ('ilātim', {'case': 'oblique', 'number': 'plural'}),
+                  ('ilātum', {'case': 'nominative', 'number': 'plural'})]))
+
+    print(sorted(decline_noun('šarratum', 'f')) ==
+          sorted([('šarratim', {'case': 'genitive', 'number': 'singular'}),
+                  ('šarratum', {'case': 'nominative', 'number': 'singular'}),
+                  ('šarratam', {'case': 'accusative', 'number': 'singular'}),
+                  ('šarratīn', {'case': 'oblique', 'number': 'dual'}),
+                  ('šarratān', {'case': 'nominative', 'number': 'dual'}),
+                  ('šarrātim', {'case': 'oblique', 'number': 'plural'}),
+                  ('šarrātum', {'case': 'nominative', 'number': 'plural'})]))
+
+    print(sorted(decline_noun('nārum', 'f')) ==
+          sorted([('nārim', {'case': 'genitive', 'number': 'singular'}),
+                  ('nārum', {'case': 'nominative', 'number': 'singular'}),
+                  ('nāram', {'case': 'accusative', 'number': 'singular'}),
+                  ('nārīn', {'case': 'oblique', 'number': 'dual'}),
+                  ('nārān', {'case': 'nominative', 'number': 'dual'}),
+                  ('nārātim', {'case': 'oblique', 'number': 'plural'}),
+                  ('nārātum', {'case': 'nominative', 'number': 'plural'})]
+                 ))
+
+
+def test_decline_nouns():
+    paradigms = list(decline_nouns([('ilum', 'm'), ('iltum', 'f'), ('x', 'f')], errors='skip'))
+    print([(lemma, [form for form, features in paradigm]) for lemma, gender, paradigm in paradigms] ==
+          [('ilum', ['ilum', 'ilam', 'ilim', 'ilān', 'ilīn', 'ilū', 'ilī']),
+           ('iltum', ['iltum', 'iltam', 'iltim', 'iltān', 'iltīn', 'ilātum', 'ilātim'])])
+    print(paradigms[0][2][0][1] is paradigms[1][2][0][1] is FEATURES['nominative', 'singular'])
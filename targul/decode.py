@@ -0,0 +1,149 @@
+"""Bulk decoding of Unicode cuneiform text into sign names and codepoints
+
+The Cuneiform block is contiguous from U+12000, so the signs of a SignList
+are kept in a dense list indexed by ord(char) - 0x12000 and no string
+comparisons are needed. names() and codepoints() go through str.translate
+and run at C speed over whole strings.
+
+Each name or codepoint is followed by a separator, a tab by default since
+sign names contain spaces ('A x BAD'), and whitespace is copied through, so
+'𒀀𒀁 𒀂' gives 'A\tA x A\t A x BAD'. Other characters outside the block, or
+without a sign, take an explicit path chosen with outside=:
+    'keep'  - left in place and followed by a separator (the default)
+    'skip'  - dropped
+    'error' - ValueError with the position of the first one
+"""
+import io
+import re
+import sys
+
+from .signs import get_sign_list
+
+BASE = 0x12000
+
+
+class BulkDecoder(object):
+    """Offset-indexed table of the signs in a SignList"""
+
+    def __init__(self, sign_list=None):
+        if sign_list is None:
+            sign_list = get_sign_list()
+        signs = [sign for sign in sign_list.sign_list if len(sign.sign) == 1 and ord(sign.sign) >= BASE]
+        size = max(ord(sign.sign) for sign in signs) - BASE + 1 if signs else 0
+
+        # dense table of offset -> Sign, None where there is no sign
+        self.records = [None] * size
+        for sign in signs:
+            offset = ord(sign.sign) - BASE
+            if self.records[offset] is None:
+                self.records[offset] = sign
+
+        # str.translate tables of ord -> name or codepoint and a separator
+        self._tables = {}
+        # matches every character without a sign, as ranges of the table
+        ranges = []
+        for offset, sign in enumerate(self.records):
+            if sign is None:
+                continue
+            if ranges and ranges[-1][1] == offset - 1:
+                ranges[-1][1] = offset
+            else:
+                ranges.append([offset, offset])
+        self.outside = re.compile('[^\\s{}]'.format(''.join(
+            '{}-{}'.format(chr(BASE + start), chr(BASE + end)) for start, end in ranges)))
+
+    def lookup(self, char):
+        """Returns the Sign for a character, or None"""
+        offset = ord(char) - BASE
+        if 0 <= offset < len(self.records):
+            return self.records[offset]
+        return None
+
+    def decode(self, text, outside='keep'):
+        """Returns a list of Sign objects for the text
+
+        With outside='keep' characters without a sign are kept as strings.
+        """
+        text = self._outside(text, outside)
+        records = self.records
+        size = len(records)
+        decoded = []
+        append = decoded.append
+        for char in text:
+            offset = ord(char) - BASE
+            sign = records[offset] if 0 <= offset < size else None
+            append(char if sign is None else sign)
+        return decoded
+
+    def names(self, text, separator='\t', outside='keep'):
+        """Returns the sign names of the text, joined by separator"""
+        return self._strip(self._translate(text, 'name', separator, outside), separator)
+
+    def codepoints(self, text, separator=' ', outside='keep'):
+        """Returns the codepoints (U+12000 ...) of the text, joined by separator"""
+        return self._strip(self._translate(text, 'codepoint', separator, outside), separator)
+
+    def decode_file(self, f, to='name', separator='\t', chunk_size=1 << 20, outside='keep'):
+        """Lazily yields the names (or to='codepoint') of an open file, chunk by chunk
+
+        With outside='error' the position reported is from the start of the file.
+        """
+        position = 0
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield self._translate(chunk, to, separator, outside, position)
+            position += len(chunk)
+
+    def _translate(self, text, to, separator, outside, position=0):
+        """Translates each sign to its name or codepoint followed by separator"""
+        key = (to, separator)
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = {ord(sign.sign): getattr(sign, to) + separator
+                                         for sign in self.records if sign is not None}
+        text = self._outside(text, outside, position)
+        if outside == 'keep' and separator:
+            # kept characters are separated like names
+            text = self.outside.sub(lambda match: match.group() + separator, text)
+        return text.translate(table)
+
+    @staticmethod
+    def _strip(text, separator):
+        if separator and text.endswith(separator):
+            return text[:-len(separator)]
+        return text
+
+    def _outside(self, text, outside, position=0):
+        if outside == 'keep':
+            return text
+        if outside == 'skip':
+            return self.outside.sub('', text)
+        if outside == 'error':
+            match = self.outside.search(text)
+            if match:
+                raise ValueError("No cuneiform sign for {!r} at position {}".format(
+                    match.group(), position + match.start()))
+            return text
+        raise ValueError("Unknown outside option: {}".format(outside))
+
+
+def test_names():
+    decoder = BulkDecoder()
+    print(decoder.names('𒀀𒀁') == 'A\tA x A')
+    print(decoder.names('𒀀𒀁 x𒀂') == 'A\tA x A\t x\tA x BAD')
+    print(decoder.names('𒀀𒀁 x𒀂', separator='|', outside='skip') == 'A|A x A| A x BAD')
+    print(decoder.codepoints('𒀀\n𒀁') == 'U+12000 \nU+12001')
+    print(''.join(decoder.decode_file(io.StringIO('𒀀𒀁\n𒀂\n'), chunk_size=2, outside='error')) ==
+          'A\tA x A\t\nA x BAD\t\n')
+    try:
+        list(decoder.decode_file(io.StringIO('𒀀𒀁\n𒀂x\n'), chunk_size=2, outside='error'))
+    except ValueError as error:
+        print(str(error) == "No cuneiform sign for 'x' at position 4")
+
+
+if __name__ == '__main__':
+    decoder = BulkDecoder()
+    for chunk in decoder.decode_file(sys.stdin):
+        sys.stdout.write(chunk)
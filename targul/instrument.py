@@ -0,0 +1,126 @@
+"""Optional counters, timers and input samples for the hot paths
+
+Instrumentation is off by default: instrumented code only checks the
+module-level `enabled` flag and timed functions are not wrapped. Turn it
+on with enable(), or for a whole run by setting TARGUL_INSTRUMENT=1, which
+also dumps a snapshot to stderr at exit.
+
+    from targul import instrument
+    instrument.enable()
+    ...
+    instrument.snapshot()
+    # {'counters': {'syllabify.CVC': 1203, ...},
+    #  'timings': {'declension.syllabify': {'calls': 900, 'seconds': 0.01}, ...},
+    #  'samples': {'get_stem.unknown': [['sum', 'x'], ...]}}
+
+Counters count the calls that reach the instrumented code, so functions
+behind a cache only count misses: get_bound_form goes through the
+lru_cache of declension.analyze_noun, and the get_stem and syllabify
+counters see each noun once however often its bound form is asked for.
+The get_bound_form timing and bound_form.* counters count every call.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+
+enabled = False
+
+# how many inputs to keep for each kind of sample
+SAMPLE_SIZE = 100
+
+counters = Counter()
+# stage -> [calls, seconds]
+timings = defaultdict(lambda: [0, 0.0])
+samples = defaultdict(list)
+
+# (function, wrapper) for each function decorated with timed
+_timed = []
+
+
+def enable():
+    """Turns on counting and swaps the timing wrappers in"""
+    global enabled
+    enabled = True
+    for owner, name, function, wrapper in _installed():
+        setattr(owner, name, wrapper)
+
+
+def disable():
+    global enabled
+    enabled = False
+    for owner, name, function, wrapper in _installed():
+        setattr(owner, name, function)
+
+
+def reset():
+    counters.clear()
+    timings.clear()
+    samples.clear()
+
+
+def count(rule, n=1):
+    counters[rule] += n
+
+
+def sample(kind, value):
+    """Keeps the first SAMPLE_SIZE values of a kind, e.g. unknown inputs"""
+    count(kind)
+    if len(samples[kind]) < SAMPLE_SIZE:
+        samples[kind].append(value)
+
+
+def timed(stage):
+    """Decorator recording calls and time spent in a function while enabled
+
+    The function itself is returned unchanged, enable() replaces it on its
+    module or class with a timing wrapper, so there is no cost while disabled.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timing = timings[stage]
+                timing[0] += 1
+                timing[1] += time.perf_counter() - start
+        _timed.append((function, wrapper))
+        return wrapper if enabled else function
+    return decorator
+
+
+def _installed():
+    """Yields (owner, name, function, wrapper) for timed functions that are defined by now"""
+    for function, wrapper in _timed:
+        owner = sys.modules.get(function.__module__)
+        path = function.__qualname__.split('.')
+        for name in path[:-1]:
+            owner = getattr(owner, name, None)
+        if owner is not None:
+            yield owner, path[-1], function, wrapper
+
+
+def snapshot():
+    """Returns a copy of the counters, timings and samples"""
+    return {
+        'counters': dict(counters.most_common()),
+        'timings': {stage: {'calls': calls, 'seconds': seconds}
+                    for stage, (calls, seconds) in sorted(timings.items(), key=lambda t: -t[1][1])},
+        'samples': {kind: list(values) for kind, values in samples.items()},
+    }
+
+
+def dump(stream=None):
+    """Writes the snapshot as json, to stderr by default"""
+    json.dump(snapshot(), stream or sys.stderr, ensure_ascii=False, indent=2)
+    (stream or sys.stderr).write('\n')
+
+
+if os.environ.get('TARGUL_INSTRUMENT'):
+    enabled = True
+    atexit.register(dump)
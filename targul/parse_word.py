@@ -0,0 +1,290 @@
+import itertools
+
+from . import instrument
+
+# Akkadian vowels and consonants
+short_vowels = ['a', 'e', 'i', 'u']
+macron_vowels = ['ā', 'ē', 'ī', 'ū']
+circumflex_vowels = ['â', 'ê', 'î', 'û']
+
+consonants = ['b', 'd', 'g', 'ḫ', 'k', 'l', 'm',
+              'n', 'p', 'q', 'r', 's', 'ṣ', 'š',
+              't', 'ṭ', 'w', 'y', 'z', 'ʾ']
+
+vowels = short_vowels + macron_vowels + circumflex_vowels
+
+# Each consonant maps to 'C' and each vowel to 'V', so word.translate(CV_CLASSES)
+# gives the CV string of a word in one pass.
+CV_CLASSES = str.maketrans({**dict.fromkeys(consonants, 'C'), **dict.fromkeys(vowels, 'V')})
+
+# Syllable weights, see find_stress
+LIGHT = 'Light'
+HEAVY = 'Heavy'
+ULTRAHEAVY = 'Ultraheavy'
+
+# For weight the vowels are told apart: short 'V', macron 'M', circumflex 'X'
+WEIGHT_CLASSES = str.maketrans({**dict.fromkeys(consonants, 'C'),
+                                **dict.fromkeys(short_vowels, 'V'),
+                                **dict.fromkeys(macron_vowels, 'M'),
+                                **dict.fromkeys(circumflex_vowels, 'X')})
+
+
+def _shape_weight(shape):
+    """Weight of a syllable shape written in WEIGHT_CLASSES, None if it has none"""
+    # Ultraheavy:
+    # -â, -bâ, -āk, -bāk, -âk, -bâk.
+    if shape in ('X', 'CX', 'MC', 'XC') or (len(shape) == 3 and shape[1] in 'MX'):
+        return ULTRAHEAVY
+    # Heavy:
+    # -ā, -bā, -ak, -bak
+    if shape in ('M', 'CM', 'VC') or (len(shape) == 3 and shape[1] == 'V'):
+        return HEAVY
+    # Light:
+    # -a, -ba
+    if shape in ('V', 'CV'):
+        return LIGHT
+    return None
+
+
+# Every syllable shape up to three characters mapped to its weight
+SYLLABLE_WEIGHTS = {''.join(shape): _shape_weight(''.join(shape))
+                    for length in (1, 2, 3)
+                    for shape in itertools.product('CVMX', repeat=length)}
+
+
+@instrument.timed('parse_word.get_syllables')
+def get_syllables(word):
+    """
+    Convert normalized word to a list of syllables.
+    This function will not analyze stress.
+
+    The general logic follows Huehnergard 3rd edition (pg. 3):
+    (a) Every syllable has one, and only one, vowel.
+    (b) With two exceptions, no syllable may begin with a vowel. The exceptions
+    are: the beginning of a word; the second of two successive vowels (note:
+    some scholars prefer to write ʾ between any two vowels in a word: e.g.,
+    kiʾam rather than our kiam).
+    (c) No syllable may begin or end with two consonants.
+    :param word: a string in Akkadian
+    :return: a list of syllables
+    """
+    return split_syllables(word, CV_CLASSES, 'get_syllables')
+
+
+def split_syllables(word, classes, stage):
+    """The syllables of a word, given the str.translate table of its CV classes
+
+    This is the syllabifier of both get_syllables and Syllabifier.syllabify,
+    and stage is the prefix of its counters when instrumentation is on.
+    """
+    counting = instrument.enabled
+    classes = word.translate(classes)
+    syllables = []
+    start = 0
+
+    # If there's an initial vowel and the word is longer than 2 letters,
+    # and the third syllable is a not consonant (easy way to check for VCC pattern),
+    # the initial vowel is the first syllable.
+    # Rule (b.ii)
+    if classes[0] == 'V' and len(word) > 2 and classes[2] != 'C':
+        syllables.append(word[0])
+        start = 1
+        if counting:
+            instrument.count(stage + '.initial_vowel')
+
+    # Here we walk the CV string backwards from the end of the word trying
+    # to match consonant and vowel patterns in a hierarchical way.
+    # Each time we find a match we slice the syllable out of the word
+    # and move the end back the length of the syllable.
+    syllables_reverse = []
+    end = len(word)
+    while end > start:
+        # CV:
+        if classes[end - 1] == 'V' and end - 2 >= start:
+            syllables_reverse.append(word[end - 2:end])
+            end -= 2
+            if counting:
+                instrument.count(stage + '.CV')
+
+        # CVC and VC:
+        elif classes[end - 1] == 'C' and end - 2 >= start and classes[end - 2] == 'V':
+            # If there are only two characters left, that's it.
+            if end - 3 < start:
+                syllables_reverse.append(word[end - 2:end])
+                end -= 2
+                if counting:
+                    instrument.count(stage + '.initial_VC')
+            # CVC
+            elif classes[end - 3] == 'C':
+                syllables_reverse.append(word[end - 3:end])
+                end -= 3
+                if counting:
+                    instrument.count(stage + '.CVC')
+            # VC
+            elif classes[end - 3] == 'V':
+                syllables_reverse.append(word[end - 2:end])
+                end -= 2
+                if counting:
+                    instrument.count(stage + '.VC')
+            else:
+                break
+        else:
+            break
+    else:
+        return syllables + syllables_reverse[::-1]
+
+    if counting:
+        instrument.sample(stage + '.unknown', word)
+    raise ValueError("Cannot syllabify: {}".format(word))
+
+
+def get_syllables_many(words, cache=None):
+    """
+    Convert a list of normalized words to lists of syllables.
+
+    Each distinct word is only syllabified once. Pass the same dict as
+    cache to reuse the results across calls.
+    :param words: a list of strings in Akkadian
+    :param cache: an optional dict of word -> tuple of syllables
+    :return: a list of lists of syllables
+    """
+    if cache is None:
+        cache = {}
+    results = []
+    for word in words:
+        syllables = cache.get(word)
+        if syllables is None:
+            syllables = cache[word] = tuple(get_syllables(word))
+        results.append(list(syllables))
+    return results
+
+
+@instrument.timed('parse_word.analyze_stress')
+def analyze_stress(word):
+    """
+    Find syllable weights and the stressed syllable in a word, following
+    the rules in find_stress.
+
+    Syllables whose shape has no weight (e.g. two vowels) get None and are
+    skipped by the stress rules.
+    :param word: a string (or list of syllables) in Akkadian
+    :return: a tuple of (syllables, weights, index of the stressed syllable)
+    """
+    if type(word) is str:
+        word = get_syllables(word)
+
+    weights = [SYLLABLE_WEIGHTS.get(syllable.translate(WEIGHT_CLASSES)) for syllable in word]
+    weighted = [i for i, weight in enumerate(weights) if weight is not None]
+
+    stressed = None
+    rule = None
+    if weighted:
+        # Rule (a)
+        if weights[weighted[-1]] == ULTRAHEAVY:
+            stressed = weighted[-1]
+            rule = 'a'
+        # Rule (b)
+        else:
+            for i in reversed(weighted[:-1]):
+                if weights[i] != LIGHT:
+                    stressed = i
+                    rule = 'b'
+                    break
+        # Rule (c)
+        if stressed is None:
+            stressed = weighted[0]
+            rule = 'c'
+
+    if instrument.enabled:
+        # a word without weighted syllables has no stress rule
+        if rule is not None:
+            instrument.count('stress.rule_{}'.format(rule))
+        for weight in weights:
+            instrument.count('stress.weight.{}'.format(weight))
+
+    return list(word), weights, stressed
+
+
+def analyze_stress_many(words, cache=None):
+    """
+    Run analyze_stress over a list of words, analyzing each distinct word once.
+
+    :param words: a list of strings (or lists of syllables) in Akkadian
+    :param cache: an optional dict of word -> (syllables, weights, stressed) tuples
+    :return: a list of (syllables, weights, stressed index) tuples, with
+    fresh syllables and weights lists for each word
+    """
+    if cache is None:
+        cache = {}
+    results = []
+    for word in words:
+        key = word if type(word) is str else tuple(word)
+        result = cache.get(key)
+        if result is None:
+            syllables, weights, stressed = analyze_stress(word)
+            result = cache[key] = tuple(syllables), tuple(weights), stressed
+        results.append((list(result[0]), list(result[1]), result[2]))
+    return results
+
+
+def find_stress(word):
+    """
+    Find the stressed syllable in a word.
+
+    The general logic follows Huehnergard 3rd edition (pgs. 3-4):
+    (a) Light: ending in a short vowel: e.g., -a, -ba
+    (b) Heavy: ending in a long vowel marked with a macron, or in a
+    short vowel plus a consonant: e.g., -ā, -bā, -ak, -bak
+    (c) Ultraheavy: ending in a long vowel marked with a circumflex,
+    in any long vowel plus a consonant: e.g., -â, -bâ, -āk, -bāk, -âk, -bâk.
+
+    (a) If the last syllable is ultraheavy, it bears the stress.
+    (b) Otherwise, stress falls on the last non-final heavy or ultraheavy syllable.
+    (c) Words that contain no non-final heavy or ultraheavy syllables have the
+    stress fall on the first syllable.
+
+    :param word: a string (or list) in Akkadian
+    :return: a list of syllables with stressed syllable surrounded by "[]"
+    """
+    syllables, weights, stressed = analyze_stress(word)
+
+    # syllables without a weight are left out, as they always have been
+    return ["[{}]".format(syllable) if i == stressed else syllable
+            for i, syllable in enumerate(syllables) if weights[i] is not None]
+
+
+def test_syllabification():
+    # small test suite
+    # TODO: move this out to a real test system
+    print(get_syllables('balāṭī') == ['ba', 'lā', 'ṭī'])
+    print(get_syllables('elûm') == ['e', 'lûm'])
+    print(get_syllables('ṣabat') == ['ṣa', 'bat'])
+    print(get_syllables('īteneppuš') == ['ī', 'te', 'nep', 'puš'])
+    print(get_syllables('narkabtum') == ['nar', 'kab', 'tum'])
+    print(get_syllables('epištašu') == ['e', 'piš', 'ta', 'šu'])
+    print(get_syllables('kiam') == ['ki', 'am'])
+    print(get_syllables('kiʾam') == ['ki', 'ʾam'])
+
+    # The syllabification rules fail on this example from the stress rules
+    print(get_syllables('ibnû') == ['ib', 'nû'])
+
+
+def test_stress():
+    print(find_stress('ibnû') == ['ib', '[nû]'])
+    print(find_stress('idūk') == ['i', '[dūk]'])
+    print(find_stress('iparras') == ['i', '[par]', 'ras'])
+    print(find_stress('nidittum') == ['ni', '[dit]', 'tum'])
+    print(find_stress('idūkū') == ['i', '[dū]', 'kū'])
+    print(find_stress('tēteneppušā') == ['tē', 'te', '[nep]', 'pu', 'šā'])
+    print(find_stress('itâršum') == ['i', '[târ]', 'šum'])
+    print(find_stress('napištašunu') == ['na', '[piš]', 'ta', 'šu', 'nu'])
+    print(find_stress('zikarum') == ['[zi]', 'ka', 'rum'])
+    print(find_stress('šunu') == ['[šu]', 'nu'])
+    print(find_stress('ilū') == ['[i]', 'lū'])
+
+
+def test_analyze_stress_many():
+    first, second = analyze_stress_many(['iparras', 'iparras'])
+    print(first == second == (['i', 'par', 'ras'], ['Light', 'Heavy', 'Heavy'], 1))
+    first[0].append('x')
+    print(second[0] == ['i', 'par', 'ras'])
@@ -0,0 +1,157 @@
+"""Run a corpus of normalized Akkadian tokens through syllabification, stress and stemming
+
+Usage:
+    python -m targul.pipeline corpus.txt [--output results.jsonl] [--processes N]
+
+Tokens are read from whitespace separated text and written as one json
+object per token, in corpus order:
+    {"token": "šarrum", "syllables": ["šar", "rum"],
+     "weights": ["Heavy", "Heavy"], "stress": 0, "stem": "šarr"}
+
+The corpus is streamed in chunks and only a bounded number of chunks are
+in flight at a time, so memory does not grow with the size of the corpus.
+"""
+import argparse
+import collections
+import itertools
+import json
+import multiprocessing
+import sys
+import time
+
+from . import declension, instrument, parse_word
+
+# per worker cache of token -> stress analysis, cleared when it gets too big
+_cache = {}
+CACHE_SIZE = 200000
+
+
+def read_tokens(f):
+    """Yields tokens from a file, one line at a time"""
+    for line in f:
+        for token in line.split():
+            yield token
+
+
+def chunks(tokens, size):
+    tokens = iter(tokens)
+    while True:
+        chunk = list(itertools.islice(tokens, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analyze_token(token, gender='m'):
+    """Returns the json object for one token"""
+    try:
+        syllables, weights, stressed = parse_word.analyze_stress(token)
+    except (ValueError, IndexError):
+        return {'token': token, 'error': "Cannot syllabify"}
+    match = declension.match_ending(token, gender)
+    return {'token': token, 'syllables': syllables, 'weights': weights,
+            'stress': stressed, 'stem': match[0] if match else None}
+
+
+def analyze_chunk(chunk, gender='m'):
+    """Returns the json lines for a chunk of tokens, analyzing each distinct token once"""
+    if len(_cache) > CACHE_SIZE:
+        _cache.clear()
+    lines = []
+    for token in chunk:
+        line = _cache.get(token)
+        if line is None:
+            line = _cache[token] = json.dumps(analyze_token(token, gender), ensure_ascii=False)
+        lines.append(line)
+    return lines
+
+
+def run(tokens, output, processes=None, chunk_size=10000, gender='m', progress=None):
+    """Analyzes tokens and writes json lines to output in order, returns the token count
+
+    With processes set (0 for one per cpu) chunks are fanned out over a
+    process pool with at most two chunks per worker in flight.
+    """
+    count = 0
+    for lines in _results(chunks(tokens, chunk_size), processes, gender):
+        output.write('\n'.join(lines) + '\n')
+        count += len(lines)
+        if progress:
+            progress(count)
+    return count
+
+
+def _results(chunked, processes, gender):
+    if processes is None:
+        for chunk in chunked:
+            yield analyze_chunk(chunk, gender)
+        return
+
+    with multiprocessing.Pool(processes or None) as pool:
+        window = 2 * (processes or multiprocessing.cpu_count())
+        pending = collections.deque()
+        for chunk in chunked:
+            pending.append(pool.apply_async(analyze_chunk, (chunk, gender)))
+            if len(pending) >= window:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+class Progress(object):
+    """Reports tokens and throughput at most every interval seconds, stream=None for silence"""
+
+    def __init__(self, interval=5.0, stream=sys.stderr):
+        self.interval = interval
+        self.stream = stream
+        self.start = self.last = time.perf_counter()
+
+    def __call__(self, count):
+        now = time.perf_counter()
+        if now - self.last >= self.interval:
+            self.last = now
+            self.report(count)
+
+    def report(self, count):
+        if self.stream is None:
+            return
+        elapsed = time.perf_counter() - self.start
+        print("{} tokens, {:.1f} s, {:.0f} tokens/s".format(count, elapsed, count / elapsed if elapsed else 0),
+              file=self.stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus', help="text file of normalized tokens, - for stdin")
+    parser.add_argument('--output', '-o', help="defaults to stdout")
+    parser.add_argument('--processes', '-p', type=int,
+                        help="use a process pool, 0 for one worker per cpu")
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--gender', choices=['m', 'f'], default='m', help="gender used for stemming")
+    parser.add_argument('--quiet', '-q', action='store_true', help="no progress report")
+    parser.add_argument('--instrument', action='store_true',
+                        help="count rule hits and time stages, dumped to stderr at the end")
+    args = parser.parse_args(argv)
+    if args.instrument and args.processes is not None:
+        parser.error("--instrument only sees the main process, use it without --processes")
+    if args.instrument:
+        instrument.enable()
+
+    progress = Progress(stream=None if args.quiet else sys.stderr)
+    corpus = sys.stdin if args.corpus == '-' else open(args.corpus, encoding='utf-8')
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        count = run(read_tokens(corpus), output, args.processes, args.chunk_size, args.gender, progress)
+    finally:
+        if corpus is not sys.stdin:
+            corpus.close()
+        if output is not sys.stdout:
+            output.close()
+    progress.report(count)
+    if args.instrument:
+        instrument.dump()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""Local analysis service keeping a SignList and the analyzers warm
+
+Usage:
+    python -m targul.service [--host 127.0.0.1] [--port 8765] [--unix /tmp/targul.sock]
+
+A small HTTP/1.1 server on asyncio, with no dependencies outside the
+standard library. Every operation is a POST of a json body {"input": ...}
+to /<operation> and answers {"result": ...} or {"error": ...}:
+
+    /lookup_sign     "𒀀"                /syllabify    "iparras"
+    /lookup_name     "A x BAD"           /stress       "iparras"
+    /lookup_codepoint "U+12000"          /decline      ["šarrum", "m"]
+    /lookup_value    ["a", "OB"]         /bound_form   ["šarrum", "m"]
+
+GET /metrics returns request, cache and batch counts and latency percentiles.
+
+Concurrent requests for the same operation are coalesced into one batch
+(up to max_batch requests, waiting at most max_delay seconds), and
+responses are kept in an LRU cache.
+"""
+import argparse
+import asyncio
+import collections
+import json
+import sys
+import time
+
+from . import declension, parse_word
+from .signs import get_sign_list
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+
+class AnalysisService(object):
+    """Batches, caches and answers analysis requests"""
+
+    def __init__(self, sign_list=None, cache_size=10000, max_batch=256, max_delay=0.002):
+        if sign_list is None:
+            sign_list = get_sign_list()
+        self.sign_list = sign_list
+        self.syllabifier = declension.get_syllabifier()
+        self.cache_size = cache_size
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        # operation -> function of a list of inputs returning a list of results
+        self.operations = {
+            'lookup_sign': lambda inputs: self._signs(inputs, 'sign'),
+            'lookup_name': lambda inputs: self._signs(inputs, 'name'),
+            'lookup_codepoint': lambda inputs: self._signs(inputs, 'codepoint'),
+            'lookup_value': lambda inputs: [[sign.to_dict() for sign in sign_list.lookup_value(*_args(item))]
+                                            for item in inputs],
+            'syllabify': self.syllabifier.syllabify_many,
+            'stress': lambda inputs: [_stress(word) for word in inputs],
+            'decline': lambda inputs: [[[form, features] for form, features in declension.decline_noun(*item)]
+                                       for item in inputs],
+            'bound_form': lambda inputs: [declension.get_bound_form(*item) for item in inputs],
+        }
+
+        self.cache = collections.OrderedDict()
+        self.queues = {}
+        # operation -> the call_later handle flushing its queue
+        self.timers = {}
+        self.metrics = collections.Counter()
+        # latencies of recent requests in seconds
+        self.latencies = collections.deque(maxlen=10000)
+
+    def _signs(self, inputs, by):
+        return [sign.to_dict() if sign else None for sign in self.sign_list.lookup_many(inputs, by)]
+
+    async def analyze(self, operation, value):
+        """Returns (status, response) for one request"""
+        start = time.perf_counter()
+        self.metrics['requests'] += 1
+        try:
+            key = (operation, json.dumps(value, ensure_ascii=False, sort_keys=True))
+        except TypeError:
+            return 400, {'error': "Input must be json"}
+        if key in self.cache:
+            self.metrics['cache_hits'] += 1
+            self.cache.move_to_end(key)
+            response = self.cache[key]
+        else:
+            future = asyncio.get_running_loop().create_future()
+            queue = self.queues.get(operation)
+            if queue is None:
+                queue = self.queues[operation] = []
+                self.timers[operation] = asyncio.get_running_loop().call_later(
+                    self.max_delay, self._flush, operation)
+            queue.append((value, future))
+            if len(queue) >= self.max_batch:
+                self._flush(operation)
+            response = await future
+            self.cache[key] = response
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        self.latencies.append(time.perf_counter() - start)
+        return (400 if 'error' in response else 200), response
+
+    def _flush(self, operation):
+        """Runs the queued batch for an operation and resolves its futures"""
+        timer = self.timers.pop(operation, None)
+        if timer is not None:
+            timer.cancel()
+        queue = self.queues.pop(operation, None)
+        if not queue:
+            return
+        self.metrics['batches'] += 1
+        self.metrics['batched_requests'] += len(queue)
+        function = self.operations[operation]
+        values = [value for value, future in queue]
+        try:
+            results = [{'result': result} for result in function(values)]
+        except Exception:
+            # one bad input fails the batch, so run them one at a time
+            results = [_single(function, value) for value in values]
+        for (value, future), result in zip(queue, results):
+            if not future.done():
+                future.set_result(result)
+
+    def snapshot(self):
+        """Returns the metrics with latency percentiles in milliseconds"""
+        latencies = sorted(self.latencies)
+        percentiles = {}
+        for name, fraction in [('p50', 0.5), ('p95', 0.95), ('p99', 0.99)]:
+            if latencies:
+                percentiles[name] = latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+        batches = self.metrics['batches']
+        return {
+            'requests': self.metrics['requests'],
+            'cache_hits': self.metrics['cache_hits'],
+            'cache_size': len(self.cache),
+            'batches': batches,
+            'mean_batch': self.metrics['batched_requests'] / batches if batches else 0,
+            'latency_ms': percentiles,
+        }
+
+    async def handle_connection(self, reader, writer):
+        """Serves HTTP/1.1 requests on one connection until it is closed"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, header = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = header.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, response = await self._route(method, path.strip('/'), body)
+                payload = json.dumps(response, ensure_ascii=False).encode('utf-8')
+                writer.write('HTTP/1.1 {} {}\r\nContent-Type: application/json; charset=utf-8\r\n'
+                             'Content-Length: {}\r\n\r\n'.format(status, REASONS[status], len(payload))
+                             .encode('latin-1') + payload)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, operation, body):
+        if operation == 'metrics':
+            return 200, self.snapshot()
+        if operation not in self.operations:
+            return 404, {'error': "Unknown operation: {}".format(operation)}
+        if method != 'POST':
+            return 405, {'error': "Use POST"}
+        try:
+            value = json.loads(body.decode('utf-8'))['input']
+        except (ValueError, KeyError, TypeError):
+            return 400, {'error': 'Body must be a json object with an "input"'}
+        return await self.analyze(operation, value)
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        """Starts listening on host and port, or on a unix socket path"""
+        if path:
+            return await asyncio.start_unix_server(self.handle_connection, path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+def _args(item):
+    return item if isinstance(item, list) else [item]
+
+
+def _stress(word):
+    syllables, weights, stressed = parse_word.analyze_stress(word)
+    return {'syllables': syllables, 'weights': weights, 'stress': stressed}
+
+
+def _single(function, value):
+    try:
+        return {'result': function([value])[0]}
+    except Exception as error:
+        return {'error': "{}: {}".format(type(error).__name__, error)}
+
+
+async def request(operation, value, host='127.0.0.1', port=8765, path=None):
+    """Sends one request to a running service and returns its json response"""
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps({'input': value}, ensure_ascii=False).encode('utf-8')
+    writer.write('POST /{} HTTP/1.1\r\nHost: {}\r\nContent-Length: {}\r\nConnection: close\r\n\r\n'
+                 .format(operation, host, len(body)).encode('latin-1') + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b'\r\n\r\n', 1)[1].decode('utf-8'))
+
+
+def test_service():
+    async def run():
+        service = AnalysisService(max_batch=4, max_delay=0.05)
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            words = ['iparras', 'šarrum', 'bēltum', 'ilum', 'awīlum', 'mārum', 'ālum', 'ekallum']
+            responses = await asyncio.gather(*[request('syllabify', word, port=port) for word in words])
+            print(responses == [{'result': result} for result in service.syllabifier.syllabify_many(words)])
+            # a full batch is flushed at once and cancels its timer
+            print(service.snapshot()['batches'] == 2 and not service.timers)
+
+            mixed = await asyncio.gather(request('syllabify', 'iparras', port=port),
+                                         request('syllabify', '', port=port),
+                                         request('syllabify', 'kalbum', port=port),
+                                         request('lookup_name', 'A x BAD', port=port))
+            print(mixed[0] == responses[0])
+            # a bad input fails alone, not the rest of its batch
+            print('error' in mixed[1] and mixed[2] == {'result': ['kal', 'bum']})
+            print(mixed[3]['result']['codepoint'] == 'U+12002')
+
+            metrics = await request('metrics', None, port=port)
+            print(metrics['requests'] == 12 and metrics['cache_hits'] == 1 and metrics['batches'] == 4)
+            print(set(metrics['latency_ms']) == {'p50', 'p95', 'p99'})
+    asyncio.run(run())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="listen on a unix socket instead")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        service = AnalysisService()
+        server = await service.start(args.host, args.port, args.unix)
+        print("Listening on {}".format(args.unix or '{}:{}'.format(args.host, args.port)), file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
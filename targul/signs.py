@@ -0,0 +1,830 @@
+import collections
+import csv
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import pickle
+import sys
+import unicodedata
+from array import array
+
+# the table of signs included with the package
+TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Table of Cuneiform Signs.csv')
+
+FIELDNAMES = ['sign', 'codepoint', 'name', 'Borger(2003)', 'Borger(1981)', 'comments']
+
+# bump when the pickled layout of SignList or Sign changes
+CACHE_VERSION = 4
+
+# where binary caches of parsed sources are kept, see SignList.cache_path
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                         'targul')
+
+SUBSCRIPTS = str.maketrans('0123456789', '₀₁₂₃₄₅₆₇₈₉')
+
+"""
+Notes:
+
+Important:
+json.dumps(json_text, ensure_ascii=False)
+"""
+
+
+class SignList:
+    """The constructor class for assembling signs into a list"""
+
+    def __init__(self, period='ALL', source=TABLE):
+        """Defaults to assembling from the included csv file and all periods
+
+        With a period other than 'ALL', lookups and iteration only return
+        signs in that period (see for_period).
+        """
+        self.period = period
+        self.source = source
+
+        # create a blank sign list
+        self.sign_list = []
+
+        # indexes from each lookup key to its Sign object
+        self.sign_index = {}
+        self.codepoint_index = {}
+        self.name_index = {}
+        # (lookup key, key) -> every sign with the key in list order, for the
+        # keys of several signs, so a period lookup finds the first sign in
+        # the period rather than the first sign
+        self.duplicates = {}
+
+        # inverted index of period -> normalized value -> list of signs,
+        # 'ALL' holds every value regardless of period
+        self.value_index = {'ALL': {}}
+        # values without periods apply to all periods
+        self.common_values = {}
+
+        # positions in sign_list of the signs in every period, and of the
+        # signs in each period, so period views need no copy of the list
+        self.universal = array('I')
+        self.period_positions = {}
+        # the three of them, swapped together by reload and read at once by
+        # period views, so a view never walks new positions over the old list
+        self.view_state = (self.sign_list, self.universal, self.period_positions)
+
+        # stamp of the source when it was last read, see reload
+        self.source_stamp = None
+
+    # attributes saved in the binary cache
+    _cached = ('sign_list', 'sign_index', 'codepoint_index', 'name_index', 'duplicates',
+               'value_index', 'common_values', 'universal', 'period_positions')
+
+    def __iter__(self):
+        if self.period == 'ALL':
+            return iter(self.sign_list)
+        return iter(self.for_period(self.period))
+
+    def for_period(self, period):
+        """Returns a view of the signs in a period, sharing this list's storage"""
+        return PeriodView(self, period)
+
+    def construct_list(self, skip=2, cache=False):
+        """Parses source file and makes list of signs
+
+        With cache=True the parsed list and its indexes are loaded from a
+        pickled cache in CACHE_DIR, which is rebuilt whenever the source
+        changes. The cache is only used for an empty list.
+        """
+        if cache and not self.sign_list:
+            if self.load_cache(skip):
+                return
+            self.construct_list(skip)
+            self.save_cache(skip)
+            return
+
+        self.source_stamp = self._source_stamp(skip)
+        for sign in self.iter_signs(skip):
+            # add Sign object with relevant data to sign list
+            self.add_sign(sign)
+
+    def iter_signs(self, skip=2):
+        """Lazily yields Sign objects from the source file, one row at a time
+
+        Nothing is added to the list, so this can stream sources that are
+        too large to hold in memory. A .json or .jsonl source holds one
+        sign_schema.json record per line, as written by create_json_from_csv,
+        and has no header to skip.
+        """
+        if self.source.endswith(('.json', '.jsonl')):
+            with open(self.source, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield Sign.from_json(json.loads(line))
+            return
+
+        with open(self.source, newline='') as f:
+            # skip number of initial lines without reading the rest
+            lines = itertools.islice(f, skip, None)
+
+            # create csv dict reader from lines
+            reader = csv.DictReader(lines, fieldnames=FIELDNAMES)
+            for line in reader:
+                # each line is a item from the table
+                yield Sign(line['codepoint'], line['sign'], line['name'],
+                           borger_2003=line['Borger(2003)'],
+                           borger_1981=line['Borger(1981)'],
+                           notes=line['comments'])
+
+    def cache_path(self):
+        """The cache file of the source, named after its file name and full path"""
+        source = os.path.abspath(self.source)
+        digest = hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(CACHE_DIR, '{}-{}.cache'.format(os.path.basename(source), digest))
+
+    def _source_stamp(self, skip, digest=True):
+        """Returns what the cache must match: version, skip, mtime, size and hash"""
+        stat = os.stat(self.source)
+        stamp = {'version': CACHE_VERSION, 'skip': skip,
+                 'mtime': stat.st_mtime_ns, 'size': stat.st_size}
+        if digest:
+            with open(self.source, 'rb') as f:
+                stamp['sha1'] = hashlib.sha1(f.read()).hexdigest()
+        return stamp
+
+    def load_cache(self, skip=2):
+        """Loads signs and indexes from the cache, returns False if it is stale
+
+        The cache is a plain pickle read in full, only the stamp is read
+        before the source is checked.
+        """
+        try:
+            with open(self.cache_path(), 'rb') as f:
+                stamp = pickle.load(f)
+                current = self._source_stamp(skip, digest=False)
+                if any(stamp.get(key) != current[key] for key in current):
+                    # a touched but unchanged source is still valid
+                    current = self._source_stamp(skip)
+                    if stamp.get('sha1') != current['sha1'] or stamp['version'] != CACHE_VERSION \
+                            or stamp['skip'] != skip:
+                        return False
+                state = pickle.load(f)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            return False
+        for name in self._cached:
+            setattr(self, name, state[name])
+        self.view_state = (self.sign_list, self.universal, self.period_positions)
+        self.source_stamp = stamp
+        return True
+
+    def save_cache(self, skip=2):
+        """Writes signs and indexes to the cache, ignoring unwritable locations"""
+        path = self.cache_path()
+        state = {name: getattr(self, name) for name in self._cached}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write to a temporary file so readers never see a partial cache
+            with open(path + '.tmp', 'wb') as f:
+                pickle.dump(self._source_stamp(skip), f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass
+
+    def reload(self, skip=2, cache=False):
+        """Re-reads a changed source, updating only the signs that differ
+
+        Rows are matched to the current signs by codepoint. Unchanged signs
+        keep their Sign objects, and only the index keys of added, changed
+        or removed signs are rebuilt, along with the keys shared by several
+        signs when unchanged signs have moved. The new list and indexes are built on
+        the side and swapped in with a single update, so readers see either
+        the old list or the new one. Signs added by hand that are not in the
+        source are removed.
+
+        Returns lists of the (added, changed, removed) codepoints, all empty
+        when the source has not changed.
+        """
+        current = self._source_stamp(skip, digest=False)
+        stamp = self.source_stamp or {}
+        if all(stamp.get(key) == current[key] for key in current):
+            return [], [], []
+        current = self._source_stamp(skip)
+        if stamp.get('sha1') == current['sha1'] and stamp.get('skip') == skip:
+            # touched but unchanged
+            self.source_stamp = current
+            return [], [], []
+
+        old = {}
+        for position, sign in enumerate(self.sign_list):
+            old.setdefault(sign.codepoint, []).append((position, sign))
+        signs = []
+        # old positions of the unchanged signs, in their new order
+        kept = []
+        added, changed, affected = [], [], []
+        for sign in self.iter_signs(skip):
+            previous = old.get(sign.codepoint)
+            if previous and _same(previous[0][1], sign):
+                position, sign = previous.pop(0)
+                kept.append(position)
+                signs.append(sign)
+                continue
+            if previous:
+                affected.append(previous.pop(0)[1])
+                changed.append(sign.codepoint)
+            else:
+                added.append(sign.codepoint)
+            affected.append(sign)
+            signs.append(sign)
+        removed = [sign.codepoint for previous in old.values() for position, sign in previous]
+        affected.extend(sign for previous in old.values() for position, sign in previous)
+        if any(a > b for a, b in zip(kept, kept[1:])):
+            # unchanged signs moved, so which sign comes first for a shared
+            # key may have changed
+            affected.extend(_shared(signs))
+
+        state = self._reindex(signs, affected)
+        state['view_state'] = (state['sign_list'], state['universal'], state['period_positions'])
+        state['source_stamp'] = current
+        # one C level update, no reader runs between two of the attributes
+        self.__dict__.update(state)
+        if cache:
+            self.save_cache(skip)
+        return added, changed, removed
+
+    def _reindex(self, signs, affected):
+        """Returns the cached attributes for signs in a new list
+
+        Index entries are shared with the current indexes, except for the
+        keys of the affected signs, which are rebuilt in list order.
+        """
+        keys = {}
+        for index, attribute in [('sign_index', 'sign'), ('codepoint_index', 'codepoint'),
+                                 ('name_index', 'name')]:
+            affected_keys = {getattr(sign, attribute) for sign in affected}
+            keys[index] = attribute, affected_keys, {key: sign for key, sign in getattr(self, index).items()
+                                                     if key not in affected_keys}
+        duplicates = {(by, key): found for (by, key), found in self.duplicates.items()
+                      if key not in keys[by + '_index'][1]}
+        # (lookup key, key) -> signs, for the affected keys
+        collected = {}
+        values = {normalize_value(value) for sign in affected for value, periods in sign.values}
+        common_values = {key: found for key, found in self.common_values.items() if key not in values}
+        value_index = {period: {key: found for key, found in index.items() if key not in values}
+                       for period, index in self.value_index.items()}
+
+        universal = array('I')
+        period_positions = {}
+        for position, sign in enumerate(signs):
+            if sign.periods is None:
+                universal.append(position)
+            else:
+                for period in sign.periods:
+                    period_positions.setdefault(period, array('I')).append(position)
+
+            for attribute, affected_keys, index in keys.values():
+                key = getattr(sign, attribute)
+                if key in affected_keys:
+                    index.setdefault(key, sign)
+                    collected.setdefault((attribute, key), []).append(sign)
+
+            # a period seen for the first time only has values of affected
+            # signs besides the period-less ones, so it is built in full here
+            _index_values(value_index, common_values, sign, sign, values)
+
+        duplicates.update((key, found) for key, found in collected.items() if len(found) > 1)
+
+        # a period no longer seen is dropped
+        seen = {period for sign in signs for value, periods in sign.values for period in periods}
+        for period in set(value_index) - seen - {'ALL'}:
+            del value_index[period]
+
+        return {
+            'sign_list': signs,
+            'sign_index': keys['sign_index'][2],
+            'codepoint_index': keys['codepoint_index'][2],
+            'name_index': keys['name_index'][2],
+            'duplicates': duplicates,
+            'value_index': value_index,
+            'common_values': common_values,
+            'universal': universal,
+            'period_positions': period_positions,
+        }
+
+    def add_sign(self, sign):
+        """Adds a Sign object to the list and its lookup indexes"""
+        position = len(self.sign_list)
+        self.sign_list.append(sign)
+
+        if sign.periods is None:
+            self.universal.append(position)
+        else:
+            for period in sign.periods:
+                self.period_positions.setdefault(period, array('I')).append(position)
+
+        # the first sign with a given key wins, as with a scan of the list
+        for by in ('sign', 'codepoint', 'name'):
+            key = getattr(sign, by)
+            first = _lookup_index(self, by).setdefault(key, sign)
+            if first is not sign:
+                self.duplicates.setdefault((by, key), [first]).append(sign)
+
+        _index_values(self.value_index, self.common_values, sign, sign)
+
+    def add_json(self, record):
+        """Adds a sign from a json object following sign_schema.json"""
+        self.add_sign(Sign.from_json(record))
+
+    def in_period(self, sign, period):
+        """Returns whether a sign has a glyph or value in the period"""
+        return period == 'ALL' or sign.periods is None or period in sign.periods
+
+    def lookup_sign(self, sign):
+        """Returns object from sign"""
+        item = self.sign_index.get(sign)
+        if self.period == 'ALL':
+            return item
+        return self._first(item, 'sign', sign, self.period)
+
+    def lookup_codepoint(self, codepoint):
+        """Returns object from codepoint"""
+        item = self.codepoint_index.get(codepoint)
+        if self.period == 'ALL':
+            return item
+        return self._first(item, 'codepoint', codepoint, self.period)
+
+    def lookup_name(self, name):
+        """Returns object from name"""
+        item = self.name_index.get(name)
+        if self.period == 'ALL':
+            return item
+        return self._first(item, 'name', name, self.period)
+
+    def lookup_many(self, keys, by='sign', period=None):
+        """Returns a list of objects (or None) for each key
+
+        by can be 'sign', 'codepoint' or 'name'
+        """
+        if period is None:
+            period = self.period
+        get = _lookup_index(self, by).get
+        if period == 'ALL':
+            return [get(key) for key in keys]
+        return [self._first(get(key), by, key, period) for key in keys]
+
+    def lookup_value(self, value, period=None):
+        """Returns a list of objects with the value (reading) in the period
+
+        Values are compared after normalize_value, so 'TI2' finds 'ti₂'.
+        Values without periods are found in every period. The period
+        defaults to the period of the list.
+        """
+        if period is None:
+            period = self.period
+        index = self.value_index.get(period, self.common_values)
+        return list(index.get(normalize_value(value), ()))
+
+    def _first(self, sign, by, key, period):
+        """Returns the first sign with the key in the period, given the first sign with the key"""
+        if sign is None or self.in_period(sign, period):
+            return sign
+        for sign in self.duplicates.get((by, key), ()):
+            if self.in_period(sign, period):
+                return sign
+        return None
+
+
+class PeriodView(object):
+    """The signs of a SignList in one period
+
+    A view holds no signs of its own: lookups go through the list's indexes
+    and return the first sign with the key in the period, and iteration walks the list's
+    precomputed positions for the period. Views of several periods share
+    the same SignList in memory.
+    """
+
+    def __init__(self, sign_list, period):
+        self.sign_list = sign_list
+        self.period = period
+
+    def __iter__(self):
+        signs, universal, period_positions = self.sign_list.view_state
+        if self.period == 'ALL':
+            return iter(signs)
+        positions = heapq.merge(universal, period_positions.get(self.period, ()))
+        return (signs[position] for position in positions)
+
+    def __len__(self):
+        signs, universal, period_positions = self.sign_list.view_state
+        if self.period == 'ALL':
+            return len(signs)
+        return len(universal) + len(period_positions.get(self.period, ()))
+
+    def __contains__(self, sign):
+        return self.sign_list.in_period(sign, self.period)
+
+    def lookup_sign(self, sign):
+        return self.sign_list._first(self.sign_list.sign_index.get(sign), 'sign', sign, self.period)
+
+    def lookup_codepoint(self, codepoint):
+        return self.sign_list._first(self.sign_list.codepoint_index.get(codepoint), 'codepoint',
+                                     codepoint, self.period)
+
+    def lookup_name(self, name):
+        return self.sign_list._first(self.sign_list.name_index.get(name), 'name', name, self.period)
+
+    def lookup_many(self, keys, by='sign'):
+        return self.sign_list.lookup_many(keys, by, self.period)
+
+    def lookup_value(self, value):
+        return self.sign_list.lookup_value(value, self.period)
+
+
+class Sign(object):
+    """This class intends to represent a cuneiform sign and its metadata
+
+    The data contained will include:
+        - The cuneiform sign in unicode
+        - The standard unicode name and codepoint address
+        - Glyph variants and known values by period
+        - Borger numbers
+        - Notes
+
+    Values and glyphs are given as in sign_schema.json, a list of
+    {'value': ..., 'periods': [...]}, no periods meaning all periods.
+    They are kept as tuples of (value, periods) pairs.
+
+    The class uses __slots__ and interned strings to keep a full sign list
+    small in every process, so use sign.to_dict() rather than sign.__dict__.
+    """
+
+    __slots__ = ('codepoint', 'sign', 'name', 'values', 'glyphs', 'periods',
+                 'borger_2003', 'borger_1981', 'notes')
+
+    def __init__(self, codepoint, sign, name, values=None, glyphs=None,
+                 borger_2003=None, borger_1981=None, notes=None):
+        """Signs are created by their codepoint (for now)"""
+        self.codepoint = sys.intern(codepoint)
+        self.sign = sys.intern(sign)
+        self.name = sys.intern(name)
+        # for now the value will be the name
+        if values is None:
+            values = [{'value': name}] if name else []
+        self.values = _compact(values, 'value')
+        if glyphs is None:
+            glyphs = [{'glyph': sign}]
+        self.glyphs = _compact(glyphs, 'glyph')
+        self.periods = _periods(self.values + self.glyphs)
+        # empty fields from the csv are stored as None
+        self.borger_2003 = borger_2003 or None
+        self.borger_1981 = borger_1981 or None
+        self.notes = notes or None
+
+    @classmethod
+    def from_json(cls, record):
+        """Creates a Sign from a json object following sign_schema.json"""
+        return cls(record['codepoint'], record['glyph'][0]['glyph'], record['name'],
+                   values=record['value'], glyphs=record['glyph'],
+                   borger_2003=record.get('borger'), notes=record.get('notes'))
+
+    def to_dict(self):
+        """Returns a json object following sign_schema.json"""
+        record = {
+            'codepoint': self.codepoint,
+            'name': self.name,
+            'glyph': _expand(self.glyphs, 'glyph'),
+            'value': _expand(self.values, 'value')
+        }
+        if self.borger_2003:
+            record['borger'] = self.borger_2003
+        if self.notes:
+            record['notes'] = self.notes
+        return record
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+
+def _compact(items, key):
+    """Turns schema style [{key: ..., 'periods': [...]}] into interned tuples"""
+    return tuple((sys.intern(item[key]), tuple(sys.intern(p) for p in item.get('periods', ())))
+                 for item in items)
+
+
+def _same(sign, other):
+    """Whether two Sign objects hold the same data"""
+    return all(getattr(sign, name) == getattr(other, name) for name in Sign.__slots__)
+
+
+def _index_values(value_index, common_values, sign, item, keys=None):
+    """Adds item under each normalized value of sign, in the periods of the value
+
+    value_index and common_values are those of SignList, and item is the
+    sign itself or, in SignStore, the offset of its record. With keys, only
+    the values in keys are indexed.
+    """
+    for value, periods in sign.values:
+        key = normalize_value(value)
+        if keys is not None and key not in keys:
+            continue
+        _index_value(value_index['ALL'], key, item)
+        if not periods:
+            _index_value(common_values, key, item)
+            for period, index in value_index.items():
+                if period != 'ALL':
+                    _index_value(index, key, item)
+            continue
+        for period in periods:
+            if period not in value_index:
+                # a new period starts with all the period-less values
+                value_index[period] = {k: list(v) for k, v in common_values.items()}
+            _index_value(value_index[period], key, item)
+
+
+def _index_value(index, key, item):
+    items = index.setdefault(key, [])
+    if item not in items:
+        items.append(item)
+
+
+def _lookup_index(owner, by):
+    """Returns the index of a SignList or SignStore for lookup_many(by=)"""
+    indexes = {
+        'sign': owner.sign_index,
+        'codepoint': owner.codepoint_index,
+        'name': owner.name_index
+    }
+    if by not in indexes:
+        raise ValueError("Unknown lookup key: {}".format(by))
+    return indexes[by]
+
+
+def _keys(sign):
+    """The lookup keys of a sign, tagged with their index"""
+    keys = {('sign', sign.sign), ('codepoint', sign.codepoint), ('name', sign.name)}
+    keys.update(('value', normalize_value(value)) for value, periods in sign.values)
+    return keys
+
+
+def _shared(signs):
+    """The signs with a lookup key in common with another sign"""
+    counts = collections.Counter(key for sign in signs for key in _keys(sign))
+    return [sign for sign in signs if any(counts[key] > 1 for key in _keys(sign))]
+
+
+def _periods(items):
+    """The periods a sign is found in, None when it is found in all of them"""
+    periods = set()
+    for item, item_periods in items:
+        if not item_periods:
+            return None
+        periods.update(item_periods)
+    return frozenset(periods)
+
+
+def _expand(items, key):
+    """Inverse of _compact"""
+    expanded = []
+    for item, periods in items:
+        if periods:
+            expanded.append({key: item, 'periods': list(periods)})
+        else:
+            expanded.append({key: item})
+    return expanded
+
+
+def normalize_value(value):
+    """Normalizes a value for lookups: NFC, lowercase, subscript numbers"""
+    return unicodedata.normalize('NFC', value).strip().lower().translate(SUBSCRIPTS)
+
+
+# the SignList of the included table, see get_sign_list
+_sign_list = None
+
+
+def get_sign_list():
+    """Returns the SignList of the included table, shared by the whole process
+
+    It is built, or loaded from the cache, on first use, and is what the
+    tools use when they are not given a SignList.
+    """
+    global _sign_list
+    if _sign_list is None:
+        sign_list = SignList()
+        sign_list.construct_list(cache=True)
+        _sign_list = sign_list
+    return _sign_list
+
+
+def benchmark_lookups(number=10):
+    """Compares indexed lookups against the old linear scan of sign_list"""
+    import timeit
+
+    sign_list = SignList()
+    sign_list.construct_list()
+    signs = [item.sign for item in sign_list.sign_list]
+
+    def scan(sign):
+        for item in sign_list.sign_list:
+            if item.sign == sign:
+                return item
+
+    scan_time = timeit.timeit(lambda: [scan(sign) for sign in signs], number=number)
+    index_time = timeit.timeit(lambda: [sign_list.lookup_sign(sign) for sign in signs], number=number)
+    many_time = timeit.timeit(lambda: sign_list.lookup_many(signs), number=number)
+
+    lookups = len(signs) * number
+    print("linear scan:  {:.0f} lookups/s".format(lookups / scan_time))
+    print("index:        {:.0f} lookups/s".format(lookups / index_time))
+    print("lookup_many:  {:.0f} lookups/s".format(lookups / many_time))
+    print("speedup:      {:.0f}x".format(scan_time / many_time))
+
+
+def benchmark_startup(number=20):
+    """Compares parsing the csv against loading the binary cache"""
+    import timeit
+
+    SignList().construct_list(cache=True)
+
+    def parse():
+        SignList().construct_list()
+
+    def load():
+        SignList().construct_list(cache=True)
+
+    parse_time = timeit.timeit(parse, number=number) / number
+    load_time = timeit.timeit(load, number=number) / number
+    print("parse csv:  {:.2f} ms".format(parse_time * 1000))
+    print("load cache: {:.2f} ms".format(load_time * 1000))
+    print("speedup:    {:.1f}x".format(parse_time / load_time))
+
+
+def benchmark_memory():
+    """Compares memory of the slotted Sign list against the old __dict__ Sign
+
+    The old Sign only held codepoint, sign and name, so it is measured as it
+    was and also carrying the same fields as the slotted Sign.
+    """
+    import tracemalloc
+
+    class OldSign(object):
+        def __init__(self, codepoint, sign, name):
+            self.codepoint = codepoint
+            self.sign = sign
+            self.name = name
+
+    with open(TABLE) as f:
+        rows = list(csv.reader(f.readlines()[2:]))
+
+    def measure(build):
+        tracemalloc.start()
+        signs = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del signs
+        return size
+
+    def build_old():
+        return [OldSign(codepoint, sign, name) for sign, codepoint, name, borger_2003, borger_1981, notes in rows]
+
+    def build_old_fields():
+        signs = []
+        for sign, codepoint, name, borger_2003, borger_1981, notes in rows:
+            old = OldSign(codepoint, sign, name)
+            old.values = ((name, ()),)
+            old.glyphs = ((sign, ()),)
+            old.periods = None
+            old.borger_2003 = borger_2003 or None
+            old.borger_1981 = borger_1981 or None
+            old.notes = notes or None
+            signs.append(old)
+        return signs
+
+    def build_slotted():
+        signs = []
+        for sign, codepoint, name, borger_2003, borger_1981, notes in rows:
+            signs.append(Sign(codepoint, sign, name, borger_2003=borger_2003,
+                              borger_1981=borger_1981, notes=notes))
+        return signs
+
+    old = measure(build_old)
+    old_fields = measure(build_old_fields)
+    slotted = measure(build_slotted)
+    print("old Sign, 3 fields:    {:.0f} KiB".format(old / 1024))
+    print("old Sign, same fields: {:.0f} KiB".format(old_fields / 1024))
+    print("slotted Sign:          {:.0f} KiB".format(slotted / 1024))
+    print("saving, same fields:   {:.0%}".format(1 - slotted / old_fields))
+
+
+def test_reload():
+    import random
+    import tempfile
+
+    def state(sign_list):
+        codepoints = lambda found: [sign.codepoint for sign in found]
+        return ([sign.to_dict() for sign in sign_list.sign_list],
+                [{key: sign.codepoint for key, sign in getattr(sign_list, index).items()}
+                 for index in ('sign_index', 'codepoint_index', 'name_index')],
+                {key: codepoints(found) for key, found in sign_list.duplicates.items()},
+                {period: {key: codepoints(found) for key, found in index.items()}
+                 for period, index in sign_list.value_index.items()},
+                {key: codepoints(found) for key, found in sign_list.common_values.items()},
+                list(sign_list.universal),
+                {period: list(positions) for period, positions in sign_list.period_positions.items()})
+
+    def record(number, name, values):
+        return {'codepoint': 'U+{:X}'.format(0x12000 + number), 'name': name,
+                'glyph': [{'glyph': chr(0x12000 + number)}], 'value': values}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'signs.jsonl')
+        modified = [0]
+
+        def write(records):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(item, ensure_ascii=False) + '\n' for item in records)
+            # distinct mtimes, as a rewrite of the same size may keep the old one
+            modified[0] += 1
+            os.utime(path, ns=(modified[0] * 10 ** 9, modified[0] * 10 ** 9))
+
+        def fresh():
+            sign_list = SignList(source=path)
+            sign_list.construct_list()
+            return sign_list
+
+        # two signs with the same name and value, swapped
+        records = [record(0, 'X', [{'value': 'x'}]), record(1, 'X', [{'value': 'x'}])]
+        write(records)
+        sign_list = fresh()
+        write(records[::-1])
+        sign_list.reload()
+        print(sign_list.lookup_name('X').codepoint == 'U+12001' and state(sign_list) == state(fresh()))
+
+        # random adds, changes, removals and reorders of signs sharing names,
+        # values and periods
+        generator = random.Random(0)
+        names, values, periods = ['A', 'B', 'C'], ['a', 'á', 'b', 'c₂'], ['OB', 'NA', 'OA']
+
+        def random_record():
+            chosen = [{'value': value} for value in generator.sample(values, generator.randint(0, 2))]
+            for item in chosen:
+                if generator.random() < 0.5:
+                    item['periods'] = generator.sample(periods, generator.randint(1, 2))
+            return record(generator.randrange(8), generator.choice(names), chosen)
+
+        records = [random_record() for _ in range(6)]
+        write(records)
+        sign_list = fresh()
+        same = True
+        for _ in range(200):
+            edit = generator.choice(['add', 'change', 'remove', 'reorder'])
+            if edit == 'add' or not records:
+                records.insert(generator.randint(0, len(records)), random_record())
+            elif edit == 'change':
+                records[generator.randrange(len(records))] = random_record()
+            elif edit == 'remove':
+                del records[generator.randrange(len(records))]
+            else:
+                generator.shuffle(records)
+            write(records)
+            sign_list.reload()
+            same = same and state(sign_list) == state(fresh())
+        print(same)
+
+        # a view started before a reload keeps walking the list it started on
+        write([record(number, 'A', [{'value': 'a', 'periods': ['OB']}]) for number in range(8)])
+        sign_list.reload()
+        signs = iter(sign_list.for_period('OB'))
+        first = next(signs)
+        write([record(0, 'A', [{'value': 'a', 'periods': ['OB']}])])
+        sign_list.reload()
+        print(first.codepoint == 'U+12000' and len(list(signs)) == 7 and len(sign_list.for_period('OB')) == 1)
+
+
+def test_period_view():
+    def record(number, name, periods):
+        return {'codepoint': 'U+{:X}'.format(0x12000 + number), 'name': name,
+                'glyph': [{'glyph': chr(0x12000 + number), 'periods': periods}],
+                'value': [{'value': name.lower(), 'periods': periods}]}
+
+    records = [record(0, 'X', ['OA']), record(1, 'X', ['OB']), record(2, 'Y', ['OA', 'OB']),
+               {'codepoint': 'U+12003', 'name': 'Z', 'glyph': [{'glyph': '𒀃'}], 'value': [{'value': 'z'}]}]
+    sign_list = SignList()
+    ob_list = SignList(period='OB')
+    for item in records:
+        sign_list.add_json(item)
+        ob_list.add_json(item)
+
+    view = sign_list.for_period('OB')
+    print([sign.codepoint for sign in view] == ['U+12001', 'U+12002', 'U+12003'] and len(view) == 3)
+    print(view.lookup_name('X').codepoint == 'U+12001' and ob_list.lookup_name('X').codepoint == 'U+12001')
+    print(sign_list.lookup_name('X').codepoint == 'U+12000')
+    # lookups agree with iteration in every period
+    for period in ['OA', 'OB', 'NA']:
+        view = sign_list.for_period(period)
+        first = {}
+        for sign in view:
+            first.setdefault(sign.name, sign)
+        print(all(view.lookup_name(name) is first.get(name) for name in ['X', 'Y', 'Z', 'W']))
+    view = sign_list.for_period('OB')
+    print([sign and sign.codepoint for sign in view.lookup_many(['X', 'Z', 'W'], by='name')] ==
+          ['U+12001', 'U+12003', None])
+    print(view.lookup_sign('𒀀') is None and view.lookup_codepoint('U+12001').name == 'X')
+    print([sign.codepoint for sign in view.lookup_value('x')] == ['U+12001'])
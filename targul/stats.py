@@ -0,0 +1,295 @@
+"""Sign and sign n-gram frequencies over Unicode cuneiform corpora
+
+Usage:
+    python -m targul.stats corpus.txt [more.txt ...] [-n 2] [--approximate] [--processes N] [--top 20]
+
+Files are read in chunks. Each chunk is counted at C speed with
+collections.Counter, and the distinct signs and n-grams of the chunk are
+then added to counters indexed by offset in the Cuneiform block (see
+decode.BulkDecoder), so the totals are flat arrays rather than dicts of
+strings. An n-gram is a run of n signs with no other character in
+between, and runs that span two chunks are still counted.
+
+n-grams are counted in a dense array while it stays below DENSE_SIZE
+cells and in a dict of packed offsets above that, or with dense=False.
+The dense 2-gram table of the full block is some 850k cells (6.8 MB), so
+files counted in a process pool use the dict, which only holds the
+n-grams seen, and are merged into the total. With approximate=True
+they go into a count-min sketch of fixed size instead, which never
+undercounts and suits large n and very large corpora, but cannot list
+the most common n-grams.
+
+Statistics with the same options can be merged, so files can be counted
+in separate processes and added up.
+"""
+import argparse
+import collections
+import multiprocessing
+import random
+import sys
+from array import array
+from operator import add
+
+from .decode import BulkDecoder
+
+# largest n-gram table kept as a dense array
+DENSE_SIZE = 1 << 22
+
+# the sketch hashes packed n-grams modulo this prime, which is above any
+# packed 6-gram, so keys for larger n are reduced modulo it first
+PRIME = (1 << 61) - 1
+
+
+class SignStatistics(object):
+    """Streaming unigram and n-gram counts of the signs in a text"""
+
+    def __init__(self, decoder=None, n=2, approximate=False, width=1 << 20, depth=4, seed=0, dense=True):
+        if decoder is None:
+            decoder = BulkDecoder()
+        # offset -> character, '' where the table has no sign
+        self.signs = [sign.sign if sign is not None else '' for sign in decoder.records]
+        self.offsets = {char: offset for offset, char in enumerate(self.signs) if char}
+        self.size = len(self.signs)
+        self.n = n
+        self.approximate = approximate
+
+        self.unigrams = array('Q', bytes(8 * self.size))
+        # characters that are not signs, other than whitespace
+        self.outside = 0
+        self.total = 0
+        self.ngram_total = 0
+        if approximate:
+            rng = random.Random(seed)
+            self.width = width
+            self.hashes = [(rng.randrange(1, PRIME), rng.randrange(PRIME)) for _ in range(depth)]
+            self.sketch = [array('Q', bytes(8 * width)) for _ in range(depth)]
+            self.ngrams = None
+        elif dense and self.size ** n <= DENSE_SIZE:
+            self.ngrams = array('Q', bytes(8 * self.size ** n))
+        else:
+            self.ngrams = {}
+        # the last n - 1 characters of the previous chunk
+        self._tail = ''
+
+    def _options(self):
+        options = (self.signs, self.n, self.approximate)
+        if self.approximate:
+            options += (self.width, self.hashes)
+        return options
+
+    def update(self, text):
+        """Counts a chunk of text, continuing the n-grams of the previous chunk"""
+        offsets = self.offsets
+        unigrams = self.unigrams
+        for char, count in collections.Counter(text).items():
+            offset = offsets.get(char)
+            if offset is not None:
+                unigrams[offset] += count
+                self.total += count
+            elif not char.isspace():
+                self.outside += count
+
+        n = self.n
+        text = self._tail + text
+        self._tail = text[-(n - 1):] if n > 1 else ''
+        size = self.size
+        for gram, count in collections.Counter(zip(*[text[i:] for i in range(n)])).items():
+            key = 0
+            for char in gram:
+                offset = offsets.get(char)
+                if offset is None:
+                    break
+                key = key * size + offset
+            else:
+                self._add(key, count)
+                self.ngram_total += count
+
+    def _add(self, key, count):
+        if self.approximate:
+            key %= PRIME
+            for (a, b), row in zip(self.hashes, self.sketch):
+                row[(a * key + b) % PRIME % self.width] += count
+        elif isinstance(self.ngrams, dict):
+            self.ngrams[key] = self.ngrams.get(key, 0) + count
+        else:
+            self.ngrams[key] += count
+
+    def end(self):
+        """Ends a document, so no n-gram spans it and the next one"""
+        self._tail = ''
+
+    def update_file(self, f, chunk_size=1 << 20):
+        """Counts an open text file chunk by chunk"""
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            self.update(chunk)
+        self.end()
+
+    def count(self, signs):
+        """Returns the count of a sign, or of an n-gram as a string of n signs
+
+        In approximate mode n-gram counts can be too high, never too low.
+        """
+        if len(signs) == 1:
+            offset = self.offsets.get(signs)
+            return self.unigrams[offset] if offset is not None else 0
+        if len(signs) != self.n:
+            raise ValueError("Counting {}-grams, not {}-grams".format(self.n, len(signs)))
+        key = 0
+        for char in signs:
+            offset = self.offsets.get(char)
+            if offset is None:
+                return 0
+            key = key * self.size + offset
+        if self.approximate:
+            key %= PRIME
+            return min(row[(a * key + b) % PRIME % self.width] for (a, b), row in zip(self.hashes, self.sketch))
+        if isinstance(self.ngrams, dict):
+            return self.ngrams.get(key, 0)
+        return self.ngrams[key]
+
+    def most_common(self, k=None, n=1):
+        """Returns [(signs, count)] for the k most common signs, or n-grams with n=self.n"""
+        if n == 1:
+            counts = ((self.signs[offset], count) for offset, count in enumerate(self.unigrams) if count)
+        elif n != self.n:
+            raise ValueError("Counting {}-grams, not {}-grams".format(self.n, n))
+        elif self.approximate:
+            raise ValueError("A count-min sketch cannot list its n-grams")
+        else:
+            items = self.ngrams.items() if isinstance(self.ngrams, dict) else enumerate(self.ngrams)
+            counts = ((self._unpack(key), count) for key, count in items if count)
+        return sorted(counts, key=lambda item: -item[1])[:k]
+
+    def _unpack(self, key):
+        chars = []
+        for _ in range(self.n):
+            key, offset = divmod(key, self.size)
+            chars.append(self.signs[offset])
+        return ''.join(reversed(chars))
+
+    def merge(self, other):
+        """Adds the counts of statistics kept with the same options, returns self
+
+        Dense and dict n-gram tables can be merged into each other.
+        """
+        if self._options() != other._options():
+            raise ValueError("Cannot merge statistics with different options")
+        self.unigrams = array('Q', map(add, self.unigrams, other.unigrams))
+        self.outside += other.outside
+        self.total += other.total
+        self.ngram_total += other.ngram_total
+        if self.approximate:
+            self.sketch = [array('Q', map(add, row, other_row)) for row, other_row in zip(self.sketch, other.sketch)]
+        elif isinstance(other.ngrams, dict):
+            for key, count in other.ngrams.items():
+                self._add(key, count)
+        elif isinstance(self.ngrams, dict):
+            for key, count in enumerate(other.ngrams):
+                if count:
+                    self._add(key, count)
+        else:
+            self.ngrams = array('Q', map(add, self.ngrams, other.ngrams))
+        return self
+
+
+def count_file(path, options):
+    """Returns the statistics of one file"""
+    statistics = SignStatistics(**options)
+    with open(path, encoding='utf-8') as f:
+        statistics.update_file(f)
+    return statistics
+
+
+def count_files(paths, processes=None, **options):
+    """Returns the merged statistics of several files
+
+    With processes set (0 for one per cpu) each file is counted in a
+    process pool, with dict n-gram tables so that workers do not send back
+    a whole dense table per file, and the results are merged as they come in.
+    """
+    decoder = options.pop('decoder', None) or BulkDecoder()
+    total = SignStatistics(decoder, **options)
+    if processes is None:
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                total.update_file(f)
+        return total
+
+    options['decoder'] = decoder
+    options['dense'] = False
+    with multiprocessing.Pool(processes or None) as pool:
+        for statistics in pool.imap_unordered(_count_file, [(path, options) for path in paths]):
+            total.merge(statistics)
+    return total
+
+
+def _count_file(args):
+    return count_file(*args)
+
+
+def test_statistics():
+    statistics = SignStatistics()
+    # 𒀁𒀀 spans the two chunks, the space and x break n-grams
+    statistics.update('𒀀𒀁')
+    statistics.update('𒀀 x𒀁𒀀')
+    print(statistics.count('𒀀') == 3 and statistics.count('𒀁') == 2)
+    print(statistics.total == 5 and statistics.outside == 1 and statistics.ngram_total == 3)
+    print(statistics.count('𒀀𒀁') == 1 and statistics.count('𒀁𒀀') == 2 and statistics.count('𒀀𒀀') == 0)
+    statistics.end()
+    statistics.update('𒀀')
+    print(statistics.count('𒀀𒀀') == 0)
+    print(statistics.most_common(1, 2) == [('𒀁𒀀', 2)])
+
+    # a dict table merged into a dense one, as count_files does
+    other = SignStatistics(dense=False)
+    other.update('𒀀𒀁𒀂')
+    statistics.merge(other)
+    print(statistics.count('𒀀𒀁') == 2 and statistics.count('𒀁𒀂') == 1 and statistics.count('𒀀') == 5)
+
+    # packed 7-grams are above PRIME, the sketch still never undercounts
+    approximate = SignStatistics(n=7, approximate=True, width=64)
+    exact = SignStatistics(n=7, dense=False)
+    text = ''.join(chr(0x12000 + (i * 7919) % 900) for i in range(2000))
+    for counter in (approximate, exact):
+        counter.update(text)
+    print(all(approximate.count(signs) >= count for signs, count in exact.most_common()))
+
+    # files counted in a pool add up to the same as counted in turn
+    import os
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i, chunk in enumerate([text[:700], text[700:], '𒀀𒀁\n𒀁𒀀']):
+            paths.append(os.path.join(directory, '{}.txt'.format(i)))
+            with open(paths[-1], 'w', encoding='utf-8') as f:
+                f.write(chunk)
+        pooled, serial = count_files(paths, processes=2), count_files(paths)
+        print(pooled.most_common(None, 2) == serial.most_common(None, 2) and pooled.unigrams == serial.unigrams)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus', nargs='+')
+    parser.add_argument('-n', type=int, default=2, help="length of the n-grams")
+    parser.add_argument('--approximate', action='store_true', help="count n-grams in a count-min sketch")
+    parser.add_argument('--processes', '-p', type=int, help="count files in a process pool, 0 for one per cpu")
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    statistics = count_files(args.corpus, args.processes, n=args.n, approximate=args.approximate)
+    print("{} signs, {} {}-grams, {} other characters".format(
+        statistics.total, statistics.ngram_total, statistics.n, statistics.outside), file=sys.stderr)
+    for signs, count in statistics.most_common(args.top):
+        print(signs, count, sep='\t')
+    if not args.approximate and statistics.n > 1:
+        print()
+        for signs, count in statistics.most_common(args.top, statistics.n):
+            print(signs, count, sep='\t')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""Lazily loaded sign store over a JSON lines file
+
+    >>> store = SignStore('signs.jsonl')
+    >>> store.lookup_name('A').to_dict()
+
+The file holds one sign_schema.json record per line, as written by
+create_json_from_csv. It is memory-mapped, and a side index from codepoint,
+sign, name and normalized value to the byte offset of each record is kept
+next to it (signs.jsonl.index), rebuilt whenever the file changes. A record
+is only decoded into a Sign when it is looked up, and the most recently
+used ones are kept in a small LRU, so a worker pays for the signs it uses
+rather than for the whole file.
+
+The lookups are the same as those of targul.SignList.
+"""
+import json
+import mmap
+import os
+import pickle
+from collections import OrderedDict
+
+from .signs import Sign, _index_values, _lookup_index, normalize_value
+
+# bump when the pickled layout of the index changes
+INDEX_VERSION = 1
+
+
+class SignStore(object):
+    """Sign lookups backed by a memory-mapped JSON lines file"""
+
+    def __init__(self, path, cache_size=256):
+        self.path = path
+        self.cache_size = cache_size
+        # offset -> Sign, most recently used last
+        self.cache = OrderedDict()
+
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        # an empty file cannot be mapped
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+        index = self.load_index()
+        if index is None:
+            index = self.build_index()
+            self.save_index(index)
+        # sorted offsets of every record, and key -> offset of its first record
+        self.offsets = index['offsets']
+        self.sign_index = index['sign']
+        self.codepoint_index = index['codepoint']
+        self.name_index = index['name']
+        # period -> normalized value -> offsets, as SignList.value_index
+        self.value_index = index['value']
+        self.common_values = index['common']
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __iter__(self):
+        """Yields every sign in file order, without filling the LRU"""
+        for offset in self.offsets:
+            sign = self.cache.get(offset)
+            yield sign if sign is not None else self._decode(offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map:
+            self._map.close()
+        self._file.close()
+
+    def index_path(self):
+        return self.path + '.index'
+
+    def _stamp(self):
+        stat = os.fstat(self._file.fileno())
+        return {'version': INDEX_VERSION, 'mtime': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def load_index(self):
+        """Returns the saved index, or None if it is missing or stale"""
+        try:
+            with open(self.index_path(), 'rb') as f:
+                if pickle.load(f) != self._stamp():
+                    return None
+                return pickle.load(f)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def save_index(self, index):
+        """Writes the index next to the file, ignoring unwritable locations"""
+        path = self.index_path()
+        try:
+            with open(path + '.tmp', 'wb') as f:
+                pickle.dump(self._stamp(), f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(index, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass
+
+    def build_index(self):
+        """Reads each record once and returns the offsets of its keys
+
+        The first record with a given key wins, as in SignList.
+        """
+        index = {'offsets': [], 'sign': {}, 'codepoint': {}, 'name': {},
+                 'value': {'ALL': {}}, 'common': {}}
+        offset = 0
+        for line in iter(self._map.readline, b'') if self._map else ():
+            if line.strip():
+                sign = self._parse(line)
+                index['offsets'].append(offset)
+                index['sign'].setdefault(sign.sign, offset)
+                index['codepoint'].setdefault(sign.codepoint, offset)
+                index['name'].setdefault(sign.name, offset)
+                _index_values(index['value'], index['common'], sign, offset)
+            offset += len(line)
+        return index
+
+    @staticmethod
+    def _parse(line):
+        return Sign.from_json(json.loads(line.decode('utf-8')))
+
+    def _decode(self, offset):
+        end = self._map.find(b'\n', offset)
+        return self._parse(self._map[offset:end if end != -1 else len(self._map)])
+
+    def _record(self, offset):
+        """Returns the Sign at an offset, through the LRU"""
+        if offset is None:
+            return None
+        sign = self.cache.get(offset)
+        if sign is not None:
+            self.cache.move_to_end(offset)
+            return sign
+        sign = self.cache[offset] = self._decode(offset)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return sign
+
+    def lookup_sign(self, sign):
+        """Returns object from sign"""
+        return self._record(self.sign_index.get(sign))
+
+    def lookup_codepoint(self, codepoint):
+        """Returns object from codepoint"""
+        return self._record(self.codepoint_index.get(codepoint))
+
+    def lookup_name(self, name):
+        """Returns object from name"""
+        return self._record(self.name_index.get(name))
+
+    def lookup_many(self, keys, by='sign'):
+        """Returns a list of objects (or None) for each key
+
+        by can be 'sign', 'codepoint' or 'name'
+        """
+        get = _lookup_index(self, by).get
+        return [self._record(get(key)) for key in keys]
+
+    def lookup_value(self, value, period='ALL'):
+        """Returns a list of objects with the value (reading) in the period
+
+        Values are compared after normalize_value, as in SignList.
+        """
+        index = self.value_index.get(period, self.common_values)
+        return [self._record(offset) for offset in index.get(normalize_value(value), ())]
+
+
+def test_store():
+    import tempfile
+
+    from .signs import SignList
+
+    def record(number, name, values):
+        return {'codepoint': 'U+{:X}'.format(0x12000 + number), 'name': name,
+                'glyph': [{'glyph': chr(0x12000 + number)}], 'value': values}
+
+    def write(path, records):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(item, ensure_ascii=False) + '\n' for item in records)
+
+    def codepoints(signs):
+        return [sign.codepoint if sign else None for sign in signs]
+
+    records = [record(0, 'A', [{'value': 'a'}, {'value': 'ti₂', 'periods': ['OB']}]),
+               record(1, 'A', [{'value': 'a', 'periods': ['NA']}]),
+               record(2, 'B', [{'value': 'TI2'}, {'value': 'b', 'periods': ['OB', 'NA']}]),
+               record(3, 'C', [])]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'signs.jsonl')
+        write(path, records)
+        sign_list = SignList(source=path)
+        sign_list.construct_list()
+        with SignStore(path, cache_size=2) as store:
+            print(len(store) == 4 and [sign.to_dict() for sign in store] == records)
+            print(all(codepoints([store.lookup_name(name), store.lookup_sign(chr(0x12000 + number))]) ==
+                      codepoints([sign_list.lookup_name(name), sign_list.lookup_sign(chr(0x12000 + number))])
+                      for number, name in enumerate(['A', 'B', 'C', 'D', 'E'])))
+            print(codepoints(store.lookup_many(['U+12001', 'U+12009'], by='codepoint')) == ['U+12001', None])
+            print(all(codepoints(store.lookup_value(value, period)) ==
+                      codepoints(sign_list.lookup_value(value, period))
+                      for value in ['a', 'ti2', 'b', 'x'] for period in ['ALL', 'OB', 'NA', 'OA']))
+            # the LRU never holds more than cache_size signs
+            print(len(store.cache) == 2)
+
+        # a rewritten file gets a new index rather than the saved one
+        write(path, records[2:] + [record(5, 'A', [{'value': 'e'}])])
+        with SignStore(path) as store:
+            print(store.lookup_name('A').codepoint == 'U+12005' and store.lookup_value('a') == [])
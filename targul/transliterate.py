@@ -0,0 +1,166 @@
+"""Convert transliterated text to Unicode cuneiform
+
+    >>> converter = Transliterator()
+    >>> converter.convert('a-na ṭur₄')
+
+Sign values and names from a SignList are compiled into a trie of
+normalized characters (see targul.normalize_value), and each line is
+segmented by longest match in a single pass. A match has to end at a
+separator, so names with spaces such as 'A x BAD' are still found whole.
+Signs within a word ('-' or '.') are joined and words keep a single space.
+Anything that does not match is copied through unchanged, as in the input,
+and a separator next to it is kept, so 'xx-yy' stays two pieces.
+"""
+import sys
+import unicodedata
+
+from .signs import SUBSCRIPTS, get_sign_list
+
+# separators within a word and between words
+SIGN_SEPARATORS = '-.'
+WORD_SEPARATORS = ' \t'
+
+# marks the end of a key in the trie, the value is the sign
+END = None
+
+
+class Transliterator(object):
+    """Longest match converter from transliteration to cuneiform signs"""
+
+    def __init__(self, sign_list=None, period='ALL'):
+        if sign_list is None:
+            sign_list = get_sign_list()
+        self.trie = {}
+        # values first, so a name never shadows a reading
+        index = sign_list.value_index.get(period, sign_list.common_values)
+        for value, signs in index.items():
+            self.add(value, signs[0])
+        for name, sign in sign_list.name_index.items():
+            if name:
+                self.add(fold(name), sign, replace=False)
+
+    def add(self, key, sign, replace=True):
+        """Adds a normalized key for a sign to the trie"""
+        node = self.trie
+        for char in key:
+            node = node.setdefault(char, {})
+        if replace or END not in node:
+            node[END] = sign
+
+    def segment(self, line):
+        """Yields (text, sign or None) for each piece of a line
+
+        Separators are yielded with no sign, as is text that matched no sign.
+        The text is from the line as given, only the trie walk is folded.
+        """
+        line = line.rstrip('\n')
+        folded, offsets = fold_with_offsets(line)
+        i = 0
+        length = len(folded)
+        while i < length:
+            char = folded[i]
+            if char in SIGN_SEPARATORS or char in WORD_SEPARATORS:
+                yield line[offsets[i]:offsets[i + 1]], None
+                i += 1
+                continue
+
+            # walk the trie as far as it goes, remembering the longest key
+            # that ends at a separator or the end of the line
+            node = self.trie
+            match = None
+            j = i
+            while j < length and folded[j] in node:
+                node = node[folded[j]]
+                j += 1
+                if END in node and (j == length or folded[j] in SIGN_SEPARATORS or folded[j] in WORD_SEPARATORS):
+                    match = j, node[END]
+
+            if match:
+                yield line[offsets[i]:offsets[match[0]]], match[1]
+                i = match[0]
+            else:
+                # copy the unknown sign through up to the next separator
+                j = i + 1
+                while j < length and folded[j] not in SIGN_SEPARATORS and folded[j] not in WORD_SEPARATORS:
+                    j += 1
+                yield line[offsets[i]:offsets[j]], None
+                i = j
+
+    def convert(self, line):
+        """Returns the line in cuneiform
+
+        Separators between two signs are dropped, or become a single space
+        between words. A separator next to unmatched text is kept.
+        """
+        output = []
+        separators = ''
+        # whether the last piece written was a sign, None at the start
+        previous = None
+        for text, sign in self.segment(line):
+            if sign is None and (text in SIGN_SEPARATORS or text in WORD_SEPARATORS):
+                separators += text
+                continue
+            if previous is not None and separators:
+                if any(char in WORD_SEPARATORS for char in separators):
+                    output.append(' ')
+                elif not (previous and sign is not None):
+                    output.append(separators)
+            separators = ''
+            previous = sign is not None
+            output.append(sign.sign if sign is not None else text)
+        if previous is False and separators and not any(char in WORD_SEPARATORS for char in separators):
+            output.append(separators)
+        return ''.join(output)
+
+    def convert_lines(self, lines):
+        """Lazily converts an iterable of lines, e.g. an open file"""
+        for line in lines:
+            yield self.convert(line)
+
+
+def fold(text):
+    """normalize_value for a whole line, without stripping it"""
+    return unicodedata.normalize('NFC', text).lower().translate(SUBSCRIPTS)
+
+
+def fold_with_offsets(line):
+    """Returns the folded line and, for each folded character, its offset in the line
+
+    The offsets have one more entry, the length of the line, so a folded
+    span [i:j] is line[offsets[i]:offsets[j]].
+    """
+    if unicodedata.is_normalized('NFC', line) and len(line.lower()) == len(line):
+        # one folded character for each character of the line
+        return fold(line), range(len(line) + 1)
+    folded = []
+    offsets = []
+    i = 0
+    while i < len(line):
+        # a character and the combining marks after it fold together
+        j = i + 1
+        while j < len(line) and unicodedata.combining(line[j]):
+            j += 1
+        piece = fold(line[i:j])
+        folded.append(piece)
+        offsets.extend([i] * len(piece))
+        i = j
+    offsets.append(len(line))
+    return ''.join(folded), offsets
+
+
+def test_convert():
+    converter = Transliterator()
+    print(converter.convert('a-na') == '𒀀𒈾')
+    print(converter.convert('lugal-e DUMU') == '𒈗𒂊 DUMU')
+    print(converter.convert('a-na xx-yy') == '𒀀𒈾 xx-yy')
+    print(converter.convert('a-Xy3 zz') == '𒀀-Xy3 zz')
+    print(converter.convert('a-na-') == '𒀀𒈾')
+    print(converter.convert('qq.') == 'qq.')
+    print(converter.convert('a\u0301-na') == 'a\u0301-𒈾')
+    print([text for text, sign in converter.segment('A-nA xx')] == ['A', '-', 'nA', ' ', 'xx'])
+
+
+if __name__ == '__main__':
+    converter = Transliterator()
+    for converted in converter.convert_lines(sys.stdin):
+        print(converted)